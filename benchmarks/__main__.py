@@ -0,0 +1,100 @@
+"""Run rendering benchmark suite.
+
+Usage::
+
+    python -m benchmarks [--save FILE] [--compare FILE] [--threshold PCT]
+                         [--large] [-k SUBSTRING]
+
+Reports operations per second and peak traced memory of each case. With
+--compare, exits with non-zero status when any case got slower (or uses
+more memory) than the saved baseline by more than threshold percent.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.suite import CASES
+
+def measure(case, min_time=0.5, min_runs=3):
+    case.run()  # warm up caches and lazily built data
+
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        case.run()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if runs >= min_runs and elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    try:
+        case.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"ops": runs / elapsed, "peak_kb": peak / 1024}
+
+def find_regressions(results, baseline, threshold):
+    limit = threshold / 100
+    res = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current["ops"] < base["ops"] * (1 - limit):
+            res.append("{}: {:.1f} ops/s, baseline {:.1f} ops/s"
+                       .format(name, current["ops"], base["ops"]))
+        if current["peak_kb"] > base["peak_kb"] * (1 + limit):
+            res.append("{}: {:.0f} KiB peak, baseline {:.0f} KiB"
+                       .format(name, current["peak_kb"], base["peak_kb"]))
+    return res
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save results as baseline")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare results with saved baseline")
+    parser.add_argument("--threshold", type=float, default=10,
+                        help="allowed regression in percent (default 10)")
+    parser.add_argument("--large", action="store_true",
+                        help="include 100k row cases")
+    parser.add_argument("-k", metavar="SUBSTRING", default="",
+                        help="only run cases with SUBSTRING in name")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="minimal measured time per case in seconds")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for case in CASES:
+        if case.large and not args.large:
+            continue
+        if args.k not in case.name:
+            continue
+
+        results[case.name] = r = measure(case, min_time=args.min_time)
+        print("{:20} {:12.1f} ops/s {:10.0f} KiB peak"
+              .format(case.name, r["ops"], r["peak_kb"]))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions over {}%:".format(args.threshold))
+            for i in regressions:
+                print("  " + i)
+            return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Compare compiled accessors with splitting the path on every lookup.
+
+Run as ``python -m benchmarks.accessors``.
+"""
+from timeit import timeit
+from types import SimpleNamespace
+
+from flask_bootstrap_components.tables import compile_accessor
+
+def split_getattr(r, attr):
+    for i in attr.split('.'):
+        r = getattr(r, i)
+        if r is None:
+            return None
+    return r
+
+ROW = SimpleNamespace(
+    customer=SimpleNamespace(address=SimpleNamespace(city="Prague"),
+                             manager=None)
+)
+
+CASES = [
+    "customer.address.city",
+    "customer.manager.name",
+]
+
+def main(number=200000):
+    for path in CASES:
+        accessor = compile_accessor(path)
+        assert accessor(ROW) == split_getattr(ROW, path)
+        split = timeit(lambda: split_getattr(ROW, path), number=number)
+        compiled = timeit(lambda: accessor(ROW), number=number)
+        print("{:24} split {:6.3f} us  compiled {:6.3f} us  ({:.1f}x)"
+              .format(path,
+                      split / number * 1e6,
+                      compiled / number * 1e6,
+                      split / compiled))
+
+if __name__ == '__main__':
+    main()
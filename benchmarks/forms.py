@@ -0,0 +1,68 @@
+"""Render page with 500 forms and compare scoped auth key derivation with
+the previous implementation (fresh HMAC for every key access).
+
+Run as ``python -m benchmarks.forms``.
+"""
+import base64
+import hmac
+from hashlib import sha256
+from timeit import timeit
+
+from flask import Flask, request, current_app
+from markupsafe import Markup
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.csrf import (
+    get_session_id, get_scoped_auth_key
+)
+from flask_bootstrap_components.forms import Form
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'bench'
+FlaskBootstrapComponents(app)
+
+@app.route('/')
+def index():
+    return ""
+
+FORMS = 500
+
+class ButtonForm(Form):
+    def form_body(self):
+        return Markup('<button type="submit">Go</button>')
+
+def legacy_scoped_auth_key(scope):
+    scope += "\n" + request.endpoint
+    scope += "\n" + current_app.secret_key
+    d = hmac.new(get_session_id(), scope.encode("utf-8"), sha256).digest()
+    return base64.b64encode(d[:18]).decode('ascii')
+
+def render_page():
+    with app.test_request_context('/'):
+        return Markup("").join(ButtonForm(name="form{}".format(i)).__html__()
+                               for i in range(FORMS))
+
+def derive_keys(derive):
+    for i in range(FORMS):
+        # hidden_trigger_field and validate_trigger_field
+        derive("form{}".format(i))
+        derive("form{}".format(i))
+
+def main():
+    with app.test_request_context('/'):
+        assert legacy_scoped_auth_key("x") == get_scoped_auth_key("x")
+        legacy = timeit(lambda: derive_keys(legacy_scoped_auth_key),
+                        number=20) / 20
+
+    # Each repetition in fresh request, as memoized keys live for one request
+    current = 0
+    for i in range(20):
+        with app.test_request_context('/'):
+            current += timeit(lambda: derive_keys(get_scoped_auth_key),
+                              number=1) / 20
+    page = timeit(render_page, number=20) / 20
+    print("keys for {} forms: legacy {:.2f} ms  current {:.2f} ms  ({:.1f}x)"
+          .format(FORMS, legacy * 1000, current * 1000, legacy / current))
+    print("page with {} forms: {:.2f} ms".format(FORMS, page * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""Compare element() with cached static_element().
+
+Run as ``python -m benchmarks.markup``.
+"""
+from timeit import timeit
+
+from flask_bootstrap_components.markup import element, static_element
+
+CASES = [
+    ("li", {"class": "nav-item"}, "Item"),
+    ("li", {"class": "breadcrumb-item active"}, "Current"),
+    ("button", {"class": "btn btn-light btn-sm ", "type": "button"}, "OK"),
+    ("td", {}, "<cell>"),
+    ("div", {"class": "btn-group", "title": None}, "x"),
+]
+
+def main(number=100000):
+    for name, attrs, contents in CASES:
+        assert (element(name, attrs, contents)
+                == static_element(name, attrs, contents))
+        plain = timeit(lambda: element(name, attrs, contents),
+                       number=number)
+        cached = timeit(lambda: static_element(name, attrs, contents),
+                        number=number)
+        print("{:8} {:40} element {:6.2f} us  static_element {:6.2f} us"
+              "  ({:.1f}x)".format(name, repr(attrs)[:40],
+                                   plain / number * 1e6,
+                                   cached / number * 1e6,
+                                   plain / cached))
+
+if __name__ == '__main__':
+    main()
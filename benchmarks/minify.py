@@ -0,0 +1,58 @@
+"""Compare sizes of tables rendered with original and minified templates.
+
+Run as ``python -m benchmarks.minify``. Equivalence of rendered DOM is
+checked by tests/test_minify.py.
+"""
+from flask import Flask, render_template_string
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.tables import (
+    PlainTable, PagedTable, SortablePagedTable, KeysetPagedTable,
+    WindowedTable
+)
+
+TABLES = {
+    "table": lambda: PlainTable(["A", "B"],
+                                [[i, "<{}>".format(i)] for i in range(50)],
+                                name="plain"),
+    "paged_table": lambda: PagedTable(["A", "B"],
+                                      [[i, i * 2] for i in range(500)],
+                                      name="paged"),
+    "sortable_paged_table": lambda: SortablePagedTable(
+        ["A", "B"], [[i, "x{}".format(i)] for i in range(500)],
+        name="sortable"
+    ),
+    "keyset_paged_table": lambda: KeysetPagedTable(
+        ["A", "B"], [[i, i] for i in range(500)],
+        key=lambda r: r[0], name="keyset"
+    ),
+    "windowed_table": lambda: WindowedTable(
+        ["A", "B"], [[i, i] for i in range(500)], name="windowed"
+    ),
+}
+
+def make_app(minify):
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'bench'
+    FlaskBootstrapComponents(app, minify_templates=minify)
+
+    @app.route('/')
+    def index():
+        return ""
+
+    return app
+
+def render(app, factory, path='/'):
+    with app.test_request_context(path):
+        return render_template_string("{{table}}", table=factory())
+
+def main():
+    apps = {minify: make_app(minify) for minify in (False, True)}
+    for name, factory in TABLES.items():
+        plain = render(apps[False], factory)
+        minified = render(apps[True], factory)
+        print("{:22} {:8} bytes  minified {:8} bytes  ({:.0f}%)"
+              .format(name, len(plain), len(minified),
+                      len(minified) / len(plain) * 100))
+
+if __name__ == '__main__':
+    main()
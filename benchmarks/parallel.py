@@ -0,0 +1,68 @@
+"""Scaling of parallel table rendering with number of workers.
+
+Run as ``python -m benchmarks.parallel [ROWS]``. Thread pools only scale
+on free-threaded CPython builds.
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from types import SimpleNamespace
+
+from flask import Flask
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.tables import ObjectTable, ObjectColumn
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'bench'
+FlaskBootstrapComponents(app)
+
+WORKERS = (1, 2, 4, 8)
+
+def make_data(rows):
+    return [SimpleNamespace(id=i,
+                            name="<item {}>".format(i),
+                            owner=SimpleNamespace(name="owner {}".format(i % 13)),
+                            price=i * 1.25,
+                            active=i % 3 == 0)
+            for i in range(rows)]
+
+def table(data, **kwargs):
+    return ObjectTable([ObjectColumn("Id", "id"),
+                        ObjectColumn("Name", "name"),
+                        ObjectColumn("Owner", "owner.name"),
+                        ObjectColumn("Price", "price"),
+                        ObjectColumn("Active", "active")],
+                       data, name="parallel", lazy=True,
+                       parallel_threshold=10000, **kwargs)
+
+def measure(data, runs=3, **kwargs):
+    best = None
+    for i in range(runs):
+        start = time.perf_counter()
+        html = str(table(data, **kwargs).__html__())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, html
+
+def main(rows=100000):
+    data = make_data(rows)
+    with app.test_request_context('/'):
+        sequential, expected = measure(data)
+        print("{:8} {:>2} workers {:8.1f} ms".format("none", 0,
+                                                     sequential * 1000))
+
+        for kind, factory in (("thread", ThreadPoolExecutor),
+                              ("process", ProcessPoolExecutor)):
+            for workers in WORKERS:
+                with factory(workers) as executor:
+                    measure(data, runs=1, parallel=executor,
+                            workers=workers)  # start workers
+                    elapsed, html = measure(data, parallel=executor,
+                                            workers=workers)
+                assert html == expected
+                print("{:8} {:>2} workers {:8.1f} ms  ({:.2f}x)"
+                      .format(kind, workers, elapsed * 1000,
+                              sequential / elapsed))
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,180 @@
+"""Rendering benchmark cases run against the example application."""
+from types import SimpleNamespace
+
+from flask import Blueprint
+from markupsafe import Markup
+
+from example import app
+from flask_bootstrap_components.tables import (
+    PlainTable, ObjectTable, PagedTable, ObjectColumn, ObjectLinkColumn
+)
+from flask_bootstrap_components.datasources import ExactRowCount
+from flask_bootstrap_components.nav import Nav
+from flask_bootstrap_components.breadcrumbs import Breadcrumbs
+from flask_bootstrap_components.toolbars import Toolbar
+from flask_bootstrap_components.forms import Form
+from flask_bootstrap_components.component import (
+    InteractiveComponent, IntStateSlot, OptionalStateSlot, BooleanStateSlot
+)
+
+bp = Blueprint('bench', __name__, url_prefix='/bench')
+
+@bp.route('/item/<int:id>')
+def item(id):
+    return ""
+
+@bp.route('/section<int:n>/')
+@bp.route('/section<int:n>/<sub>')
+def section(n, sub=None):
+    return ""
+
+app.register_blueprint(bp)
+
+class Case:
+    def __init__(self, name, func, path='/', large=False):
+        self.name = name
+        self.func = func
+        self.path = path
+        self.large = large
+
+    def run(self):
+        with app.test_request_context(self.path):
+            return str(self.func())
+
+_data = {}
+
+def sequence_rows(count):
+    if ("seq", count) not in _data:
+        _data["seq", count] = [[i, "row {}".format(i), i * 0.5, i % 2 == 0,
+                                None if i % 7 else "<x>"]
+                               for i in range(count)]
+    return _data["seq", count]
+
+def object_rows(count):
+    if ("obj", count) not in _data:
+        _data["obj", count] = [
+            SimpleNamespace(id=i,
+                            name="object {}".format(i),
+                            owner=SimpleNamespace(name="owner {}".format(i % 13)),
+                            active=i % 3 == 0)
+            for i in range(count)
+        ]
+    return _data["obj", count]
+
+def nested_rows(count):
+    if ("nested", count) not in _data:
+        _data["nested", count] = [
+            SimpleNamespace(
+                order=SimpleNamespace(
+                    id=i,
+                    customer=SimpleNamespace(
+                        address=SimpleNamespace(city="city {}".format(i % 50)),
+                        tags=["tag {}".format(i % 5)]),
+                    meta={"source": "web" if i % 2 else "shop"}))
+            for i in range(count)
+        ]
+    return _data["nested", count]
+
+def plain_table(count):
+    return lambda: PlainTable(["A", "B", "C", "D", "E"],
+                              sequence_rows(count),
+                              name="plain").__html__()
+
+def object_table(count):
+    return lambda: ObjectTable([ObjectColumn("Id", "id"),
+                                ObjectColumn("Name", "name"),
+                                ObjectColumn("Owner", "owner.name"),
+                                ObjectColumn("Active", "active")],
+                               object_rows(count),
+                               name="objects").__html__()
+
+def link_table(count):
+    return lambda: ObjectTable([ObjectLinkColumn("Name", "name",
+                                                 endpoint="bench.item"),
+                                ObjectLinkColumn("Owner", "owner.name",
+                                                 endpoint="bench.item"),
+                                ObjectColumn("Active", "active")],
+                               object_rows(count),
+                               name="links").__html__()
+
+def nested_table(count):
+    return lambda: ObjectTable([
+        ObjectLinkColumn("Order", "order.id", endpoint="bench.item",
+                         id_attr="order.id"),
+        ObjectColumn("City", "order.customer.address.city"),
+        ObjectColumn("Tag", "order.customer.tags[0]"),
+        ObjectColumn("Source", "order.meta[source]"),
+    ], nested_rows(count), name="nested").__html__()
+
+def paged_table():
+    return PagedTable(["A", "B", "C", "D", "E"],
+                      sequence_rows(100000),
+                      name="paged",
+                      row_count=ExactRowCount()).__html__()
+
+class StateComponent(InteractiveComponent):
+    page = IntStateSlot(0)
+    size = IntStateSlot(10)
+    sort = OptionalStateSlot()
+    descending = BooleanStateSlot(False)
+    search = OptionalStateSlot()
+
+def interactive(count):
+    def build():
+        res = [StateComponent(name="c{}".format(i)) for i in range(count)]
+        return Markup("").join(Markup(i.build_url(page=i.page + 1))
+                               for i in res[::10])
+    return build
+
+def interactive_path(count):
+    return "/?" + "&".join("c{0}__page={0}&c{0}__sort=name&x{0}=1".format(i)
+                           for i in range(count))
+
+def nav(count):
+    n = Nav()
+    for i in range(count):
+        n.add("Section {}".format(i), "bench.section", args={"n": i},
+              subendpoints=True)
+    return lambda: n.__html__()
+
+def breadcrumbs():
+    b = Breadcrumbs()
+    for i in range(10):
+        b.add("Level {}".format(i), "bench.section", n=i)
+    b.add("Current")
+    return lambda: b.__html__("Title")
+
+def toolbar():
+    t = Toolbar()
+    for i in range(10):
+        t.add_button("Button {}".format(i), "bench.section", args={"n": i},
+                     hint="Hint {}".format(i))
+        if i % 4 == 3:
+            t.add_splitter()
+    return lambda: t.__html__()
+
+class ButtonForm(Form):
+    def form_body(self):
+        return Markup('<button type="submit">Go</button>')
+
+def forms(count):
+    return lambda: Markup("").join(ButtonForm(name="form{}".format(i))
+                                   for i in range(count))
+
+CASES = [
+    Case("plain_table_100", plain_table(100)),
+    Case("plain_table_10k", plain_table(10000)),
+    Case("plain_table_100k", plain_table(100000), large=True),
+    Case("object_table_100", object_table(100)),
+    Case("object_table_10k", object_table(10000)),
+    Case("object_table_100k", object_table(100000), large=True),
+    Case("link_table_2k", link_table(2000)),
+    Case("nested_table_10k", nested_table(10000)),
+    Case("paged_table_deep", paged_table,
+         path='/?paged__cur_page=900&paged__per_page=100'),
+    Case("nav_200", nav(200), path='/bench/section150/detail'),
+    Case("breadcrumbs", breadcrumbs()),
+    Case("toolbar", toolbar()),
+    Case("forms_500", forms(500)),
+    Case("interactive_50", interactive(50), path=interactive_path(50)),
+]
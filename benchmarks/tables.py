@@ -0,0 +1,55 @@
+"""Compare compiled and generic row rendering of tables.
+
+Run as ``python -m benchmarks.tables``.
+"""
+from timeit import timeit
+from types import SimpleNamespace
+
+from flask import Flask
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.tables import (
+    PlainTable, ObjectTable, ObjectColumn, ObjectLinkColumn
+)
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'bench'
+FlaskBootstrapComponents(app)
+
+@app.route('/item/<int:id>')
+def item(id):
+    return ""
+
+ROWS = 2000
+
+def plain_table(compiled):
+    return PlainTable(["A", "B", "C", "D", "E"],
+                      [[i, "<b>{}</b>".format(i), i * 1.5, True, None]
+                       for i in range(ROWS)],
+                      name="plain", compiled=compiled)
+
+def object_table(compiled):
+    data = [SimpleNamespace(id=i, name="item {}".format(i), flag=i % 2 == 0)
+            for i in range(ROWS)]
+    return ObjectTable([ObjectLinkColumn("Name", "name", endpoint="item"),
+                        ObjectColumn("Id", "id"),
+                        ObjectColumn("Flag", "flag")],
+                       data,
+                       name="plain", compiled=compiled)
+
+def main():
+    with app.test_request_context('/'):
+        for factory in (plain_table, object_table):
+            assert (factory(True).__html__()
+                    == factory(False).__html__())
+            results = {}
+            for compiled in (False, True):
+                table = factory(compiled)
+                results[compiled] = timeit(table.__html__, number=5) / 5
+            print("{:14} generic {:8.2f} ms  compiled {:8.2f} ms  ({:.1f}x)"
+                  .format(factory.__name__,
+                          results[False] * 1000,
+                          results[True] * 1000,
+                          results[False] / results[True]))
+
+if __name__ == '__main__':
+    main()
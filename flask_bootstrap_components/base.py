@@ -2,20 +2,127 @@ from flask import current_app, Blueprint, url_for, _app_ctx_stack
 from collections import defaultdict
 
 class FlaskBootstrapComponents:
-    def __init__(self, app=None):
+    def __init__(self, app=None, **kwargs):
         self.app = app
+        self.fragment_cache = None
+        self.etag_vary = None
+        self.window_tables = {}
         if app is not None:
-            self.init_app(app)
+            self.init_app(app, **kwargs)
     
-    def init_app(self, app):
+    def init_app(self, app, fragment_cache=None,
+                 instrumentation=False, server_timing=False,
+                 etag_vary=None, url_prefix="/_fbc",
+                 minify_templates=False):
+        """Register extension with app.
+
+        Passing fragment_cache=True (or FragmentCache instance) enables
+        caching of rendered Nav, Breadcrumbs and Toolbar fragments.
+
+        instrumentation=True records render statistics of components for
+        each request, server_timing=True (implies instrumentation) also
+        reports them in Server-Timing response header.
+
+        Partial rendering of single component (see partial module) needs
+        no configuration, HTML responses get Vary header for it and partial
+        requests naming no component of the page get 404.
+
+        Responses containing tables with data_version get ETag (see
+        conditional module), etag_vary is function returning additional
+        parts of it (eg. current user when page shows user specific
+        content outside of tables).
+
+        Row windows of tables registered with row_window() are served under
+        url_prefix.
+
+        minify_templates=True renders components with whitespace and
+        comment free variants of internal templates (see minify module).
+        """
         self.app = app
+        if fragment_cache is True:
+            from .fragment_cache import FragmentCache
+            fragment_cache = FragmentCache()
+        self.fragment_cache = fragment_cache
+
+        self.etag_vary = etag_vary
+
+        from .partial import add_vary_header, check_partial_found
+        app.after_request(add_vary_header)
+        app.after_request(check_partial_found)
+        self.init_conditional(app)
+
+        if instrumentation or server_timing:
+            self.init_instrumentation(app, server_timing)
+
         if not hasattr(app, 'extensions'):
             app.extensions = {}
         app.extensions['flask_bootstrap_components'] = self
 
+        from .windows import row_window_view
         bp = Blueprint('flask_bootstrap_components', __name__, 
                        template_folder='templates')
-        app.register_blueprint(bp)
+        bp.add_url_rule('/rows/<name_prefix>', 'row_window', row_window_view)
+        if minify_templates:
+            bp.jinja_loader = self.make_minified_loader(bp.jinja_loader)
+        app.register_blueprint(bp, url_prefix=url_prefix)
+
+    def make_minified_loader(self, loader):
+        """Return loader serving minified internal templates prepared once,
+        other templates are loaded by original loader."""
+        from jinja2 import ChoiceLoader, DictLoader
+        from .minify import load_minified_templates
+
+        templates = load_minified_templates(
+            loader.searchpath[0], "flask_bootstrap_components/internal"
+        )
+        return ChoiceLoader([DictLoader(templates), loader])
+
+    def row_window(self, name_prefix, decorators=()):
+        """Register function building WindowedTable with given name_prefix,
+        used to serve further row windows of the table.
+
+        Window requests do not go through the view rendering the page, so
+        its access checks do not apply. Factory has to authorize the
+        request itself, or pass view decorators doing that (eg.
+        login_required) in decorators, they are applied to the window
+        endpoint of this table.
+        """
+        def decorator(factory):
+            from functools import partial
+            from .windows import render_window
+
+            view = partial(render_window, factory)
+            for i in reversed(decorators):
+                view = i(view)
+            self.window_tables[name_prefix] = view
+            return factory
+        return decorator
+
+    def init_conditional(self, app):
+        from flask.signals import signals_available, before_render_template
+        from . import conditional
+
+        app.after_request(conditional.add_validators)
+        # Without blinker views have to call check_not_modified() themselves
+        if signals_available:
+            before_render_template.connect(
+                conditional.on_before_render_template, app
+            )
+
+    def init_instrumentation(self, app, server_timing=False):
+        from . import instrumentation
+        instrumentation.enabled = True
+
+        app.before_request(instrumentation.RenderStats.start)
+
+        if server_timing:
+            @app.after_request
+            def add_server_timing(response):
+                stats = instrumentation.RenderStats.get_instance()
+                if stats is not None and stats.components:
+                    response.headers.add("Server-Timing",
+                                         stats.server_timing())
+                return response
 
     def generate_default_name(self, name):
         ctx = _app_ctx_stack.top
@@ -1,5 +1,8 @@
 from .utils import url_or_url_for
-from .markup import element
+from .markup import element, static_element
+from .fragment_cache import render_cached
+from .instrumentation import instrumented
+from .partial import partial_render
 from markupsafe import Markup
 
 class Breadcrumb:
@@ -10,6 +13,11 @@ class Breadcrumb:
         self.url = url
         self.kwargs = kwargs
 
+    @property
+    def definition_key(self):
+        return (type(self), None if self.name is None else str(self.name),
+                self.url, tuple(sorted(self.kwargs.items())))
+
     @property
     def href(self):
         if self.url is None:
@@ -25,15 +33,15 @@ class Breadcrumb:
         href = self.href
             
         if href:
-            return element("li",
-                           {"class": "breadcrumb-item"},
-                           element("a",
-                                   {"href": href},
-                                   name))
+            return static_element("li",
+                                  {"class": "breadcrumb-item"},
+                                  element("a",
+                                          {"href": href},
+                                          name))
         else:
-            return element("li",
-                           {"class": "breadcrumb-item active"},
-                           name)
+            return static_element("li",
+                                  {"class": "breadcrumb-item active"},
+                                  name)
     
 class Breadcrumbs:
     def __init__(self, extend=None):
@@ -47,9 +55,19 @@ class Breadcrumbs:
     def add(self, name, url=None, **kwargs):
         self.items.append(Breadcrumb(name, url, **kwargs))
 
+    def fragment_cache_key(self, title):
+        return (type(self),
+                None if title is None else str(title),
+                tuple(i.definition_key for i in self.items))
+
+    @partial_render
+    @instrumented
     def __html__(self, title):
-        ol = element("ol",
-                     {"class": "breadcrumb py-0"},
-                     Markup("").join(i.__html__(title)
-                                     for i in self.items))
-        return element("nav", {}, ol)
+        return render_cached(self, self.render_uncached, title)
+
+    def render_uncached(self, title):
+        ol = static_element("ol",
+                            {"class": "breadcrumb py-0"},
+                            Markup("").join(i.__html__(title)
+                                            for i in self.items))
+        return static_element("nav", {}, ol)
@@ -1,4 +1,4 @@
-from .markup import element
+from .markup import element, static_element
 
 def button(text, classes="", context_class="default", size=None, attrs={}, type="button"):
     cls = "btn btn-"+context_class
@@ -7,9 +7,9 @@ def button(text, classes="", context_class="default", size=None, attrs={}, type=
     a = {"class": cls + " " + classes, 
          "type": type}
     a.update(attrs)
-    return element("button", 
-                   a,
-                   text)
+    return static_element("button",
+                          a,
+                          text)
 
 def link_button(url, text, context_class="default", size=None, hint=None, link_target=None):
     cls = "btn btn-"+context_class
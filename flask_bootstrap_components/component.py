@@ -1,17 +1,22 @@
 from flask import (
     render_template,
     request,
-    url_for,
     abort,
     redirect,
     current_app,
     _app_ctx_stack,
+    _request_ctx_stack,
 )
 from markupsafe import Markup
 from .markup import element
 from .csrf import get_scoped_auth_key
 from .base import get_extension_object
+from .utils import url_for
+from .partial import PARTIAL_ARG
 from werkzeug.local import LocalProxy
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Component:
     def __init__(self, name=None, parent=None, **kwargs):
@@ -80,18 +85,36 @@ class StateSlot:
         return SlotDescriptor(self)
     
 class IntStateSlot(StateSlot):
+    """Integer slot, values from request below minimum are raised to it."""
+    def __init__(self, default=None, name=None, minimum=None):
+        super().__init__(default=default, name=name)
+        self.minimum = minimum
+
     def load_value(self, value):
-        return int(value)
+        value = int(value)
+        if self.minimum is not None and value < self.minimum:
+            value = self.minimum
+        return value
 
 class BooleanStateSlot(StateSlot):
     def load_value(self, value):
         return value == "1"
     def dump_value(self, value):
         return "1" if value else "0"
+
+class OptionalStateSlot(StateSlot):
+    """String slot where None is represented as empty argument."""
+    def load_value(self, value):
+        return value if value != "" else None
+    def dump_value(self, value):
+        return "" if value is None else str(value)
     
 class RequestStateTracker:
     def __init__(self):
         self.dirty_set = set()
+        # Incremented on every state change, used to invalidate cached URL
+        # arguments of components
+        self.version = 0
 
     @classmethod
     def get_instance(cls):
@@ -104,66 +127,159 @@ class RequestStateTracker:
     def mark_changed(self, state):
         self.dirty_set.add(state)
 
+    def state_updated(self):
+        self.version += 1
+
+    @property
+    def base_args(self):
+        """Arguments of current request used as base of component URLs.
+
+        Cached on request context, tracker itself lives on app context
+        which can be shared by several requests.
+        """
+        ctx = _request_ctx_stack.top
+        args = getattr(ctx, 'fbc_base_args', None)
+        if args is None:
+            args = dict(request.args, **(request.view_args or {}))
+            # Fragment requests must not leak into links they contain
+            args.pop(PARTIAL_ARG, None)
+            ctx.fbc_base_args = args
+        return args
+
+    @property
+    def args_index(self):
+        """Arguments of current request partitioned by name prefix, built in
+        one pass over query string.
+
+        Maps name_prefix to dict of slot names and raw values, argument
+        "a__b__page" is found under "a__b" as "page". Cached on request
+        context like base_args.
+        """
+        ctx = _request_ctx_stack.top
+        index = getattr(ctx, 'fbc_args_index', None)
+        if index is None:
+            index = {}
+            for key, value in request.args.items():
+                prefix, sep, name = key.rpartition("__")
+                if sep:
+                    index.setdefault(prefix, {})[name] = value
+            ctx.fbc_args_index = index
+        return index
+
 request_state_tracker = LocalProxy(RequestStateTracker.get_instance)
         
 class InteractiveComponentState:
+    """State of component slots.
+
+    Request arguments are looked up in index shared by all components (see
+    RequestStateTracker.args_index) and decoded only when slot value is
+    first accessed.
+    """
     def __init__(self, component, slots, name_prefix, defaults={}):
         self.component = component
         self.name_prefix = name_prefix
         self.state = {}
-        self.changed = set()
-        for i in slots:
-            arg = self.get_argument(i.name, None)
-            if arg is not None:
-                self.set_value(i, i.load_value(arg))
-                
-            elif i.name in defaults:
-                # When setting from defaults we dont want to mark slot/state
-                # as changed
-                self.state[i] = defaults[i.name]
-            else:
-                self.state[i] = i.default
-                    
+        self.slots = {i.name: i for i in slots}
+        self.defaults = defaults
+        self._base_args = None
+        self._base_args_version = None
+
+        self.args = request_state_tracker.args_index.get(name_prefix, {})
+        # Slots given in request are changed, unlike those set from
+        # defaults
+        self.changed = {i for i in slots
+                        if self.get_argument(i.name) is not None}
+        if self.changed:
+            request_state_tracker.mark_changed(self)
+            request_state_tracker.state_updated()
                 
     def convert_argument_name(self, name):
         return "{}__{}".format(self.name_prefix, name)
 
     def get_argument(self, name, default=None):
-        return request.args.get(self.convert_argument_name(name),
-                                default)
+        if "__" in name:
+            # Such arguments are indexed under longer prefix
+            return request.args.get(self.convert_argument_name(name),
+                                    default)
+        return self.args.get(name, default)
+
+    def load_slot_value(self, slot):
+        arg = self.get_argument(slot.name)
+        if arg is not None:
+            return slot.load_value(arg)
+        if slot.name in self.defaults:
+            return self.defaults[slot.name]
+        return slot.default
 
     def get_value(self, slot):
-        return self.state[slot]
+        try:
+            return self.state[slot]
+        except KeyError:
+            value = self.state[slot] = self.load_slot_value(slot)
+            return value
     
     def set_value(self, slot, value):
         self.state[slot] = value
 
         if not self.changed:
             request_state_tracker.mark_changed(self)
+        request_state_tracker.state_updated()
     
         self.changed.add(slot)
 
-    def update_slot_values(self, args, overide=set()):
-        for slot, value in self.state.items():
+    def items(self):
+        """Return list of (slot, value) pairs of all slots."""
+        return [(slot, self.get_value(slot)) for slot in self.slots.values()]
+
+    def slot_args(self):
+        """Return URL arguments of all slots of this component."""
+        return {self.convert_argument_name(slot.name): slot.dump_value(value)
+                for slot, value in self.items()}
+
+    def serialize(self):
+        """Return hashable representation of current state."""
+        return tuple(sorted((slot.name, slot.dump_value(value))
+                            for slot, value in self.items()))
+
+    def update_slot_values(self, args, overide={}):
+        for slot in self.slots.values():
             if slot.name in overide:
                 value = overide[slot.name]
             elif slot not in self.changed:
                 continue
+            else:
+                value = self.get_value(slot)
 
-            name = self.convert_argument_name(slot.name)
-            args[name] = slot.dump_value(value)
-            print(name, value)
+            args[self.convert_argument_name(slot.name)] = slot.dump_value(value)
 
         for i in self.component.interactive_children:
             i.state.update_slot_values(args)
 
+    def get_base_args(self):
+        """Return request arguments merged with changed state of this
+        component and its children.
+
+        Result is computed once and reused until some component state
+        changes.
+        """
+        version = request_state_tracker.version
+        if self._base_args is None or self._base_args_version != version:
+            args = dict(request_state_tracker.base_args)
+            self.update_slot_values(args)
+            self._base_args = args
+            self._base_args_version = version
+        return self._base_args
 
     def build_url(self, **kwargs):
-        args = dict(request.args, **request.view_args)
+        args = dict(self.get_base_args())
 
-        self.update_slot_values(args, overide=kwargs)
-            
-        print(args)
+        for name, value in kwargs.items():
+            slot = self.slots.get(name)
+            if slot is not None:
+                args[self.convert_argument_name(name)] = slot.dump_value(value)
+
+        logger.debug("Building URL for %s with arguments %r",
+                     self.name_prefix, args)
 
         return url_for(request.endpoint, **args)
             
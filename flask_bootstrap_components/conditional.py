@@ -0,0 +1,125 @@
+"""ETag and Last-Modified validators of responses built from components.
+
+Tables given data_version (and optionally last_modified) callbacks register
+themselves with ResponseValidator of current request. Validator combines
+their versions with their serialized state into ETag and answers matching
+conditional GET with 304 before the page template is rendered.
+"""
+import hashlib
+from flask import (
+    request, has_request_context, abort, Response, _app_ctx_stack
+)
+from werkzeug.http import is_resource_modified
+from .base import get_extension_object
+from .partial import get_partial_target
+
+class ResponseValidator(object):
+    def __init__(self):
+        self.components = []
+        self.parts = []
+        self.last_modified_callbacks = []
+        self.checked = False
+        self._validators = None
+
+    @classmethod
+    def get_instance(cls):
+        ctx = _app_ctx_stack.top
+        if ctx is None or not has_request_context():
+            return None
+        if not hasattr(ctx, 'fbc_response_validator'):
+            ctx.fbc_response_validator = cls()
+        return ctx.fbc_response_validator
+
+    @property
+    def active(self):
+        return bool(self.components or self.parts
+                    or self.last_modified_callbacks)
+
+    def add_component(self, component, version, last_modified=None):
+        """Register component, version and last_modified are functions
+        called when validators are computed."""
+        self.components.append((component, version))
+        if last_modified is not None:
+            self.add_last_modified(last_modified)
+
+    def add(self, *parts):
+        """Add parts of ETag not tied to any component (eg. current user)."""
+        self.parts.extend(parts)
+
+    def add_last_modified(self, func):
+        self.last_modified_callbacks.append(func)
+
+    def component_key(self, component, version):
+        state = getattr(component, "state", None)
+        if state is not None:
+            state = state.serialize()
+        return (component.name_prefix, version(), state)
+
+    def etag(self):
+        parts = (request.host_url,
+                 request.full_path,
+                 get_partial_target(),
+                 tuple(self.component_key(*i) for i in self.components),
+                 tuple(self.parts))
+        vary = get_extension_object().etag_vary
+        if vary is not None:
+            parts = (parts, vary())
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    def last_modified(self):
+        values = [i() for i in self.last_modified_callbacks]
+        values = [i for i in values if i is not None]
+        return max(values) if values else None
+
+    def compute(self):
+        """Return (etag, last_modified) of current response, computed once
+        per request."""
+        if self._validators is None:
+            self._validators = (self.etag(), self.last_modified())
+        return self._validators
+
+    def check(self):
+        """Abort with 304 when request validators match."""
+        if self.checked or not self.active:
+            return
+        self.checked = True
+
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        etag, last_modified = self.compute()
+        if not is_resource_modified(request.environ,
+                                    etag=etag,
+                                    last_modified=last_modified):
+            response = Response(status=304)
+            self.apply(response)
+            abort(response)
+
+    def apply(self, response):
+        if not self.active or request.method not in ("GET", "HEAD"):
+            return response
+        if response.status_code not in (200, 304):
+            return response
+
+        etag, last_modified = self.compute()
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        return response
+
+def check_not_modified():
+    """Answer conditional GET with 304 when none of registered components
+    changed. Called automatically before rendering templates (when
+    blinker is available), views can call it earlier."""
+    validator = ResponseValidator.get_instance()
+    if validator is not None:
+        validator.check()
+
+def on_before_render_template(sender, template, context, **extra):
+    check_not_modified()
+
+def add_validators(response):
+    validator = ResponseValidator.get_instance()
+    if validator is not None:
+        validator.apply(response)
+    return response
@@ -3,7 +3,7 @@ from hashlib import sha256
 import hmac
 import time
 import os
-from flask import current_app, session, request
+from flask import current_app, session, request, _app_ctx_stack
 import json
 
 def get_session_id():
@@ -12,12 +12,64 @@ def get_session_id():
 
     return session["__fbc_csrf"]
 
+class ScopedAuthKeyService:
+    """Derives scoped auth keys for current request.
+
+    Keeps one HMAC object keyed by session id (copied for each new scope)
+    and memoizes derived keys, so pages with many forms compute each key
+    only once.
+    """
+    def __init__(self):
+        self.session_id = None
+        self.hmac = None
+        self.secret_key = None
+        self.keys = {}
+
+    @classmethod
+    def get_instance(cls):
+        ctx = _app_ctx_stack.top
+        if ctx is None:
+            return cls()
+        if not hasattr(ctx, 'fbc_scoped_auth_key_service'):
+            ctx.fbc_scoped_auth_key_service = cls()
+        return ctx.fbc_scoped_auth_key_service
+
+    def get_key(self, scope, include_request_endpoint=True):
+        session_id = session.get("__fbc_csrf")
+        if session_id is None:
+            session_id = get_session_id()
+        if session_id != self.session_id:
+            self.session_id = session_id
+            self.hmac = hmac.new(session_id, digestmod=sha256)
+            self.secret_key = current_app.secret_key
+            self.keys = {}
+
+        # Read on every call, service can outlive request when app context
+        # is shared by several requests
+        endpoint = request.endpoint if include_request_endpoint else None
+
+        res = self.keys.get((scope, endpoint))
+        if res is not None:
+            return res
+
+        message = scope
+        if include_request_endpoint:
+            message += "\n" + endpoint
+        message += "\n" + self.secret_key
+
+        h = self.hmac.copy()
+        h.update(message.encode("utf-8"))
+        res = base64.b64encode(h.digest()[:18]).decode('ascii')
+
+        self.keys[(scope, endpoint)] = res
+        return res
+
 def get_scoped_auth_key(scope, include_request_endpoint=True):
-    if include_request_endpoint:
-        scope += "\n" + request.endpoint
-
-    scope += "\n" + current_app.secret_key
-        
-    d = hmac.new(get_session_id(), scope.encode("utf-8"), sha256).digest()
-    
-    return base64.b64encode(d[:18]).decode('ascii')
+    return ScopedAuthKeyService.get_instance().get_key(
+        scope, include_request_endpoint
+    )
+
+def check_scoped_auth_key(value, scope, include_request_endpoint=True):
+    """Compare value with scoped auth key in constant time."""
+    key = get_scoped_auth_key(scope, include_request_endpoint)
+    return hmac.compare_digest(value.encode("utf-8"), key.encode("ascii"))
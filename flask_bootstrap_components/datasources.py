@@ -0,0 +1,280 @@
+import heapq
+import time
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+class KeysetDataSource(object):
+    """Data source for keyset pagination.
+
+    Rows are ordered by unique key and pages are fetched relative to key of
+    the last (or first) row of the previously displayed page, so fetching
+    deep pages does not get slower like OFFSET does.
+    """
+    def __init__(self, key_type=str):
+        self.key_type = key_type
+
+    def key_of(self, row):
+        raise NotImplementedError
+
+    def load_key(self, value):
+        return self.key_type(value)
+
+    def dump_key(self, key):
+        return str(key)
+
+    def fetch_after(self, key, limit):
+        """Return up to limit rows with keys greater than key (all rows
+        when key is None) in ascending order."""
+        raise NotImplementedError
+
+    def fetch_before(self, key, limit):
+        """Return up to limit rows with keys immediately preceding key in
+        ascending order."""
+        raise NotImplementedError
+
+class ListKeysetDataSource(KeysetDataSource):
+    """Keyset data source over in-memory sequence already sorted by key.
+
+    When key_type is not given, it is taken from the first key.
+    """
+    def __init__(self, data, key, key_type=None):
+        if isinstance(key, str):
+            key = attrgetter(key)
+        self.data = data
+        self.key_of = key
+        self.keys = [key(i) for i in data]
+
+        if key_type is None:
+            key_type = type(self.keys[0]) if self.keys else str
+        super().__init__(key_type=key_type)
+
+    def fetch_after(self, key, limit):
+        start = 0 if key is None else bisect_right(self.keys, key)
+        return self.data[start:start + limit]
+
+    def fetch_before(self, key, limit):
+        end = bisect_left(self.keys, key)
+        return self.data[max(end - limit, 0):end]
+
+class QueryKeysetDataSource(KeysetDataSource):
+    """Keyset data source over SQLAlchemy-like query.
+
+    column is the ordering column expression, its values are read from rows
+    using key_attr (defaults to column.key).
+    """
+    def __init__(self, query, column, key_attr=None, **kwargs):
+        super().__init__(**kwargs)
+        self.query = query
+        self.column = column
+        if key_attr is None:
+            key_attr = column.key
+        self.key_of = attrgetter(key_attr)
+
+    def fetch_after(self, key, limit):
+        # Existing ordering of the query would disagree with key comparison
+        query = self.query.order_by(None)
+        if key is not None:
+            query = query.filter(self.column > key)
+        return query.order_by(self.column).limit(limit).all()
+
+    def fetch_before(self, key, limit):
+        query = (self.query
+                 .order_by(None)
+                 .filter(self.column < key)
+                 .order_by(self.column.desc())
+                 .limit(limit))
+        return list(reversed(query.all()))
+
+class RowCount(object):
+    """Strategy for counting total number of rows of paged table data."""
+    estimated = False
+
+    def count(self, data):
+        raise NotImplementedError
+
+class ExactRowCount(RowCount):
+    """Counts sequences with len() and queries with their count() method."""
+    def count(self, data):
+        try:
+            return len(data)
+        except TypeError:
+            return data.count()
+
+class EstimatedRowCount(RowCount):
+    """Uses user supplied estimate function (eg. reading table statistics
+    of the database) instead of counting rows."""
+    estimated = True
+
+    def __init__(self, estimate):
+        self.estimate = estimate
+
+    def count(self, data):
+        return self.estimate(data)
+
+class CachedRowCount(RowCount):
+    """Caches count returned by another strategy for ttl seconds.
+
+    Cache entries are keyed by result of key function called with data, by
+    default the count is shared by all data passed to this instance.
+    """
+    def __init__(self, counter=None, ttl=60, key=None):
+        if counter is None:
+            counter = ExactRowCount()
+        self.counter = counter
+        self.ttl = ttl
+        self.key = key
+        self.cache = {}
+
+    @property
+    def estimated(self):
+        return self.counter.estimated
+
+    def count(self, data):
+        key = self.key(data) if self.key else None
+        now = time.monotonic()
+
+        entry = self.cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        res = self.counter.count(data)
+        self.cache[key] = (res, now + self.ttl)
+        return res
+
+class TableDataAdapter(object):
+    """Pushes sorting and filtering of paged table data down to its source.
+
+    Adapters receive table Column objects and decide which of them they can
+    sort and filter by. Results of sort() and filter() are sliced by the
+    table, so only rows of the displayed page have to be fetched.
+    """
+    def can_sort(self, column):
+        return False
+
+    def can_filter(self, column):
+        return False
+
+    def filter(self, data, columns, terms):
+        """Return data restricted to rows where each of terms is contained
+        in value of at least one of columns."""
+        raise NotImplementedError
+
+    def sort(self, data, column, descending=False):
+        raise NotImplementedError
+
+class SortedSequence(object):
+    """Sequence sorted on demand by key, None values last.
+
+    Slices from the start are taken with partial heap sort, so showing
+    first pages of large sequence does not sort all of it.
+    """
+    def __init__(self, data, key, descending=False):
+        self.data = data
+        self.key = key
+        self.descending = descending
+        self._sorted = None
+
+    def sort_key(self, row):
+        value = self.key(row)
+        if self.descending:
+            return (value is not None, value)
+        return (value is None, value)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.sorted())
+
+    def sorted(self):
+        if self._sorted is None:
+            self._sorted = sorted(self.data, key=self.sort_key,
+                                  reverse=self.descending)
+        return self._sorted
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self.sorted()[index]
+
+        start, stop, step = index.start or 0, index.stop, index.step
+        if (self._sorted is not None or stop is None or step is not None
+            or start < 0 or stop < 0):
+            return self.sorted()[index]
+
+        select = heapq.nlargest if self.descending else heapq.nsmallest
+        return select(stop, self.data, key=self.sort_key)[start:stop]
+
+class SequenceAdapter(TableDataAdapter):
+    """Sorts and filters in-memory sequences by cell data of columns.
+
+    Filtering is case insensitive substring match of values converted to
+    strings, None never matches.
+    """
+    def can_sort(self, column):
+        return True
+
+    def can_filter(self, column):
+        return True
+
+    def filter(self, data, columns, terms):
+        getters = [i.get_cell_data for i in columns]
+        terms = [i.casefold() for i in terms]
+
+        def matches(row):
+            values = [i(row) for i in getters]
+            values = [str(i).casefold() for i in values if i is not None]
+            return all(any(term in value for value in values)
+                       for term in terms)
+
+        return [i for i in data if matches(i)]
+
+    def sort(self, data, column, descending=False):
+        return SortedSequence(data, column.get_cell_data, descending)
+
+def escape_like(term, escape="\\"):
+    """Escape LIKE pattern wildcards in term."""
+    return (term.replace(escape, escape * 2)
+            .replace("%", escape + "%")
+            .replace("_", escape + "_"))
+
+class QueryAdapter(TableDataAdapter):
+    """Adds ORDER BY and WHERE clauses to SQLAlchemy-like query.
+
+    columns maps ids of table columns (attribute names for ObjectColumn)
+    to column expressions, other table columns are neither sortable nor
+    filterable. Filtering uses case insensitive LIKE, only columns in
+    filterable (all mapped columns by default) are searched. tiebreaker
+    is appended to ORDER BY to keep pages stable when sort column values
+    repeat, usually the primary key.
+    """
+    def __init__(self, columns, filterable=None, tiebreaker=None):
+        self.columns = columns
+        if filterable is None:
+            filterable = columns.keys()
+        self.filterable = set(filterable)
+        self.tiebreaker = tiebreaker
+
+    def can_sort(self, column):
+        return column.id in self.columns
+
+    def can_filter(self, column):
+        return column.id in self.filterable
+
+    def filter(self, query, columns, terms):
+        from sqlalchemy import String, cast, or_
+
+        exprs = [cast(self.columns[i.id], String) for i in columns]
+        for term in terms:
+            pattern = "%{}%".format(escape_like(term))
+            query = query.filter(or_(*[i.ilike(pattern, escape="\\")
+                                       for i in exprs]))
+        return query
+
+    def sort(self, query, column, descending=False):
+        expr = self.columns[column.id]
+        # Ordering of the query itself would make chosen column secondary
+        query = query.order_by(None)
+        query = query.order_by(expr.desc() if descending else expr.asc())
+        if self.tiebreaker is not None:
+            query = query.order_by(self.tiebreaker)
+        return query
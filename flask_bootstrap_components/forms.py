@@ -8,10 +8,11 @@ from flask import (
     _app_ctx_stack,
 )
 from markupsafe import Markup
-from .markup import element
-from .csrf import get_scoped_auth_key
+from .markup import static_element
+from .csrf import get_scoped_auth_key, check_scoped_auth_key
 from .base import get_extension_object
 from .component import InteractiveComponent
+from .instrumentation import instrumented
 
 class FormComponent(InteractiveComponent):
     def process(self):
@@ -63,14 +64,16 @@ class Form(FormComponent):
         )
 
     def validate_trigger_field(self):
-        return request.form[self.trigger_field_name] == self.trigger_field_value
+        return check_scoped_auth_key(request.form[self.trigger_field_name],
+                                     self.name_prefix)
     
     def commit(self, **kwargs):
         abort(redirect(self.build_url(**kwargs)))
 
+    @instrumented
     def __html__(self):
         self.process_on_submit()
-        return element("form",
-                       {"method": "post"},
-                       Markup("{}{}").format(self.hidden_trigger_field,
-                                             self.form_body()))
+        return static_element("form",
+                              {"method": "post"},
+                              Markup("{}{}").format(self.hidden_trigger_field,
+                                                    self.form_body()))
@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request, has_app_context
+from markupsafe import Markup
+from .base import get_extension_object
+
+class FragmentCacheBackend(object):
+    """Storage of cached fragments, both keys and values are strings.
+
+    Subclass this to store fragments in external cache (memcached, redis,
+    ...).
+    """
+    def get(self, key):
+        """Return cached value or None."""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+class LRUFragmentCacheBackend(FragmentCacheBackend):
+    """In-process cache evicting least recently used fragments."""
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.data.get(key)
+            if value is not None:
+                self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+class FragmentCache(object):
+    """Cache of rendered Nav, Breadcrumbs and Toolbar fragments.
+
+    Fragments are keyed by component definition and the parts of request
+    they depend on (endpoint, relevant view arguments, URL root). When
+    rendering depends on something else (eg. current locale), pass vary
+    function returning additional key parts.
+    """
+    def __init__(self, backend=None, maxsize=1024, vary=None):
+        if backend is None:
+            backend = LRUFragmentCacheBackend(maxsize)
+        self.backend = backend
+        self.vary = vary
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, parts):
+        parts = (request.host_url, request.endpoint, parts)
+        if self.vary is not None:
+            parts = (parts, self.vary())
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    def get_or_render(self, parts, render):
+        key = self.make_key(parts)
+
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return Markup(value)
+
+        self.misses += 1
+        value = render()
+        self.backend.set(key, str(value))
+        return value
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+def get_fragment_cache():
+    if not has_app_context():
+        return None
+    return get_extension_object().fragment_cache
+
+def render_cached(component, render, *args, **kwargs):
+    """Render component using render function, reusing cached result when
+    fragment cache is enabled.
+
+    Component has to provide fragment_cache_key() method taking the same
+    arguments as render.
+    """
+    cache = get_fragment_cache()
+    if cache is None:
+        return render(*args, **kwargs)
+
+    return cache.get_or_render(component.fragment_cache_key(*args, **kwargs),
+                               lambda: render(*args, **kwargs))
@@ -1,4 +1,4 @@
-from .markup import element
+from .markup import static_element
 
 class GridColumn:
     __slots__ = ["widths"]
@@ -13,4 +13,4 @@ class GridColumn:
                          for k, v in self.widths.items()])
         
     def render(self, content):
-        return element("div", {"class": self.get_class()}, content)
+        return static_element("div", {"class": self.get_class()}, content)
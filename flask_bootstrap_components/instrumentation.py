@@ -0,0 +1,126 @@
+import re
+from collections import OrderedDict
+from functools import wraps
+from time import perf_counter
+from flask import current_app, _app_ctx_stack
+from flask.signals import Namespace
+
+_signals = Namespace()
+
+#: Sent after instrumented component is rendered with component,
+#: duration (in seconds), url_for_calls and rows keyword arguments.
+component_rendered = _signals.signal('fbc-component-rendered')
+
+# Set when any application enables instrumentation, keeps overhead of
+# instrumented methods to one global lookup otherwise
+enabled = False
+
+class RenderFrame:
+    __slots__ = ["url_for_calls", "rows"]
+
+    def __init__(self):
+        self.url_for_calls = 0
+        self.rows = 0
+
+class ComponentStats:
+    __slots__ = ["count", "duration", "url_for_calls", "rows"]
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.url_for_calls = 0
+        self.rows = 0
+
+class RenderStats:
+    """Render statistics of components aggregated over one request.
+
+    Durations include nested components, url_for calls and rows are
+    counted for the innermost component being rendered.
+    """
+    def __init__(self):
+        self.components = OrderedDict()
+        self.stack = []
+
+    @classmethod
+    def get_instance(cls):
+        ctx = _app_ctx_stack.top
+        if ctx is not None:
+            return getattr(ctx, 'fbc_render_stats', None)
+
+    @classmethod
+    def start(cls):
+        _app_ctx_stack.top.fbc_render_stats = cls()
+
+    def record(self, component, duration, frame):
+        name = getattr(component, "name", None) or type(component).__name__
+        stats = self.components.get(name)
+        if stats is None:
+            stats = self.components[name] = ComponentStats()
+        stats.count += 1
+        stats.duration += duration
+        stats.url_for_calls += frame.url_for_calls
+        stats.rows += frame.rows
+
+    def server_timing(self):
+        res = []
+        for name, stats in self.components.items():
+            res.append('fbc-{};dur={:.3f};desc="{} x{} rows={} url_for={}"'.format(
+                re.sub(r"[^A-Za-z0-9_-]", "_", str(name)),
+                stats.duration * 1000,
+                re.sub(r'["\\]', "_", str(name)),
+                stats.count,
+                stats.rows,
+                stats.url_for_calls
+            ))
+        return ", ".join(res)
+
+def instrumented(method):
+    """Decorate rendering method of component to record its statistics."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not enabled:
+            return method(self, *args, **kwargs)
+        stats = RenderStats.get_instance()
+        if stats is None:
+            return method(self, *args, **kwargs)
+
+        frame = RenderFrame()
+        stats.stack.append(frame)
+        start = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            duration = perf_counter() - start
+            stats.stack.pop()
+            stats.record(self, duration, frame)
+            component_rendered.send(current_app._get_current_object(),
+                                    component=self,
+                                    duration=duration,
+                                    url_for_calls=frame.url_for_calls,
+                                    rows=frame.rows)
+
+    return wrapper
+
+def _current_frame():
+    stats = RenderStats.get_instance()
+    if stats is not None and stats.stack:
+        return stats.stack[-1]
+
+def count_url_for():
+    frame = _current_frame()
+    if frame is not None:
+        frame.url_for_calls += 1
+
+def count_rows(rows):
+    """Wrap row iterator so that rendered rows are counted."""
+    if not enabled:
+        return rows
+    frame = _current_frame()
+    if frame is None:
+        return rows
+    return _counted(rows, frame)
+
+def _counted(rows, frame):
+    for i in rows:
+        frame.rows += 1
+        yield i
@@ -1,8 +1,11 @@
-from markupsafe import Markup
+from markupsafe import Markup, escape
+from functools import lru_cache
+
+STATIC_TAG_CACHE_SIZE = 1024
 
 def xmlattrs(attrs):
     res = Markup(" ").join(
-        Markup('{0}="{1}"').format(k, v) 
+        Markup('{0}="{1}"').format(k, v)
         for k, v in attrs.items()
         if v != None
     )
@@ -19,4 +22,25 @@ def element(name, attrs, contents):
                                          contents,
                                          name)
 
+@lru_cache(maxsize=STATIC_TAG_CACHE_SIZE)
+def _cached_xmltag(name, key):
+    return xmltag(name, {k: v for k, _, v in key})
+
+def static_xmltag(name, attrs):
+    """Same as xmltag(), but reuses opening tags for repeating attribute sets.
+
+    Meant for attributes that do not change between requests (classes,
+    roles, ...), the cache is bounded to STATIC_TAG_CACHE_SIZE tags.
+    """
+    # Type is part of the key as eg. 1 == True, while they render differently
+    key = tuple((k, type(v), v) for k, v in attrs.items())
+    try:
+        return _cached_xmltag(name, key)
+    except TypeError:
+        return xmltag(name, attrs)
 
+def static_element(name, attrs, contents):
+    """Same as element(), but with opening tag from static_xmltag()."""
+    return Markup("".join((static_xmltag(name, attrs),
+                           escape(contents),
+                           "</", escape(name), ">")))
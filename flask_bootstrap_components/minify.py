@@ -0,0 +1,54 @@
+"""Whitespace and comment free variants of internal templates.
+
+Minification keeps Jinja tags untouched and only changes template text:
+HTML comments are removed, whitespace runs spanning lines are dropped
+between tags and Jinja tags (like trim_blocks and lstrip_blocks do) and
+collapsed to single space elsewhere. Resulting DOM differs only by
+whitespace-only text nodes and comments.
+"""
+import os
+import re
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_JINJA_RE = re.compile(r"({{.*?}}|{%.*?%}|{#.*?#})", re.S)
+_WHITESPACE_RE = re.compile(r"\s*\n\s*")
+
+def _minify_text(text, after_jinja, before_jinja):
+    def replace(m):
+        start, end = m.span()
+        prev = text[start - 1] if start > 0 else None
+        next = text[end] if end < len(text) else None
+        if ((prev == ">" or (prev is None and after_jinja))
+            and (next == "<" or (next is None and before_jinja))):
+            return ""
+        return " "
+
+    return _WHITESPACE_RE.sub(replace, text)
+
+def minify_template(source):
+    source = _COMMENT_RE.sub("", source)
+    pieces = _JINJA_RE.split(source)
+
+    # Text pieces are at even indices, Jinja tags at odd ones
+    res = []
+    for idx, piece in enumerate(pieces):
+        if idx % 2:
+            res.append(piece)
+        else:
+            res.append(_minify_text(piece,
+                                    after_jinja=idx > 0,
+                                    before_jinja=idx < len(pieces) - 1))
+    return "".join(res).strip()
+
+def load_minified_templates(folder, subdirectory):
+    """Return mapping of template names to minified sources of templates
+    in subdirectory of template folder."""
+    res = {}
+    for name in sorted(os.listdir(os.path.join(folder, subdirectory))):
+        if not name.endswith(".html"):
+            continue
+        template_name = "{}/{}".format(subdirectory, name)
+        with open(os.path.join(folder, subdirectory, name),
+                  encoding="utf-8") as f:
+            res[template_name] = minify_template(f.read())
+    return res
@@ -1,8 +1,12 @@
+import re
 from markupsafe import Markup
-from fnmatch import fnmatchcase
+from fnmatch import fnmatchcase, translate
 from flask import request
-from .markup import *
+from .markup import element, static_element
 from .utils import url_or_url_for
+from .fragment_cache import render_cached
+from .instrumentation import instrumented
+from .partial import partial_render
 
 class NavItem:
     __slots__ = ["label", "target", "args", "preserve_args",
@@ -20,6 +24,12 @@ class NavItem:
         if subendpoints:
             subendpoint_pattern = target + "*"
         self.subendpoint_pattern = subendpoint_pattern
+
+    @property
+    def definition_key(self):
+        return (type(self), str(self.label), self.target,
+                tuple(sorted(self.args.items())), tuple(self.preserve_args),
+                self.subendpoint_pattern)
         
     @property
     def is_active(self):
@@ -33,30 +43,87 @@ class NavItem:
 
     @property
     def url(self):
+        if not self.preserve_args:
+            return url_or_url_for(self.target, **self.args)
+
         params = self.args.copy()
         for i in self.preserve_args:
             params[i] = request.view_args[i]
         
         return url_or_url_for(self.target, **params)
+
+    def get_a_attrs(self, active):
+        return {'href': self.url,
+                "class": "nav-link active" if active else "nav-link"}
     
     @property
     def a_attrs(self):
-        klasses = ["nav-link"]
-
-        if self.is_active:
-            klasses.append("active")
-
-        return {'href': self.url, "class": " ".join(klasses)}
+        return self.get_a_attrs(self.is_active)
 
     @property
     def li_attrs(self):
         return {"class": "nav-item"}
     
     def __html__(self):
+        return self.render(self.is_active)
+
+    def render(self, active):
         link = element('a',
-                       self.a_attrs,
+                       self.get_a_attrs(active),
                        self.label)
-        return element('li', self.li_attrs, link)
+        return static_element('li', self.li_attrs, link)
+
+    @classmethod
+    def supports_matcher(cls):
+        """True when active state of items of this class can be determined
+        by EndpointMatcher and passed to render()."""
+        return (cls.is_active is NavItem.is_active
+                and cls.a_attrs is NavItem.a_attrs
+                and cls.__html__ is NavItem.__html__)
+
+class EndpointMatcher:
+    """Finds all active items of a nav for given endpoint at once.
+
+    Exact targets and plain ``prefix*`` patterns are looked up in dicts,
+    other patterns are precompiled. Results are cached per endpoint.
+    """
+    def __init__(self, items):
+        self.exact = {}
+        self.prefixes = {}
+        self.patterns = []
+        self.cache = {}
+
+        for idx, item in enumerate(items):
+            self.exact.setdefault(item.target, set()).add(idx)
+
+            pattern = item.subendpoint_pattern
+            if not pattern:
+                continue
+            prefix = pattern[:-1]
+            if pattern.endswith("*") and not any(c in prefix for c in "*?["):
+                self.prefixes.setdefault(prefix, set()).add(idx)
+            else:
+                self.patterns.append((re.compile(translate(pattern)).match,
+                                      idx))
+
+    def match(self, endpoint):
+        res = self.cache.get(endpoint)
+        if res is not None:
+            return res
+
+        res = set()
+        if endpoint is not None:
+            res.update(self.exact.get(endpoint, ()))
+            if self.prefixes:
+                for i in range(len(endpoint) + 1):
+                    res.update(self.prefixes.get(endpoint[:i], ()))
+            for match, idx in self.patterns:
+                if match(endpoint):
+                    res.add(idx)
+
+        res = frozenset(res)
+        self.cache[endpoint] = res
+        return res
         
 class Nav:
     item_class = NavItem
@@ -64,9 +131,24 @@ class Nav:
     def __init__(self, preserve_args=[]):
         self.items = []
         self.preserve_args = preserve_args
+        self._definition_key = None
+        self._matcher = None
         
     def add_item(self, item):
         self.items.append(item)
+        self._definition_key = None
+        self._matcher = None
+
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            self._matcher = EndpointMatcher(self.items)
+        return self._matcher
+
+    @property
+    def active_items(self):
+        """Set of indexes of items active for current request."""
+        return self.matcher.match(request.endpoint)
         
     def add(self, label, target, preserve_args=None, **kwargs):
         if preserve_args is None:
@@ -81,9 +163,29 @@ class Nav:
     def ul_attrs(self):
         return {"class": "nav"}
         
+    def fragment_cache_key(self):
+        if self._definition_key is None:
+            self._definition_key = (
+                type(self),
+                tuple(sorted(self.ul_attrs.items())),
+                tuple(i.definition_key for i in self.items)
+            )
+        view_args = request.view_args or {}
+        preserved = {j for i in self.items for j in i.preserve_args}
+        return (self._definition_key,
+                tuple(sorted((i, view_args.get(i)) for i in preserved)))
+
+    def render_uncached(self):
+        active = self.active_items
+        items = [i.render(idx in active) if i.supports_matcher() else i
+                 for idx, i in enumerate(self.items)]
+        return static_element('ul', self.ul_attrs,
+                              Markup("").join(items))
+
+    @partial_render
+    @instrumented
     def __html__(self):
-        return element('ul', self.ul_attrs,
-                       Markup("").join(self.items))
+        return render_cached(self, self.render_uncached)
 
 class NavTabs(Nav):
     @property
@@ -0,0 +1,73 @@
+"""Rendering of table row chunks on thread or process pools.
+
+Pools are shared by all tables and created on first use, see
+get_executor().
+"""
+import contextvars
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def get_executor(kind, workers=None):
+    """Return shared executor of kind ("thread" or "process") with given
+    number of workers (defaults to CPU count), Executor instances are
+    returned as they are."""
+    if isinstance(kind, Executor):
+        return kind
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    key = (kind, workers)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(workers,
+                                              thread_name_prefix="fbc-render")
+            elif kind == "process":
+                executor = ProcessPoolExecutor(workers)
+            else:
+                raise ValueError("Unknown executor kind {!r}".format(kind))
+            _executors[key] = executor
+        return executor
+
+def shutdown_executors(wait=True):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for i in executors:
+        i.shutdown(wait=wait)
+
+def render_cells_chunk(columns, rows):
+    """Render rows using batch API of columns, runs in worker process."""
+    from .tables import join_cells
+    return [str(i) for i in join_cells([i.get_cells_html(rows)
+                                        for i in columns],
+                                       len(rows))]
+
+def ordered_map(executor, func, chunks, window, copy_context=False):
+    """Like executor.map(), but keeps at most window chunks in flight, so
+    lazily produced chunks are not all read into memory at once.
+
+    With copy_context, func runs in copy of current context (Flask
+    application and request context included), thread pools only.
+    """
+    pending = deque()
+    for chunk in chunks:
+        if copy_context:
+            future = executor.submit(contextvars.copy_context().run,
+                                     func, chunk)
+        else:
+            future = executor.submit(func, chunk)
+        pending.append(future)
+
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,71 @@
+"""Rendering of single component for in-place refresh.
+
+Request naming name_prefix of component in X-FBC-Partial header (or in
+_fbc_partial query argument) is answered with HTML of just that component,
+as soon as it is rendered. Other components render as empty strings in the
+meantime, unless they contain the requested one. Pages not containing the
+requested component at all are answered with 404.
+"""
+from functools import wraps
+from flask import request, has_request_context, abort, Response, _app_ctx_stack
+from werkzeug.exceptions import NotFound
+from markupsafe import Markup
+
+PARTIAL_HEADER = "X-FBC-Partial"
+PARTIAL_ARG = "_fbc_partial"
+
+def get_partial_target():
+    """Return name_prefix of component requested by current request, None
+    when whole page is requested."""
+    ctx = _app_ctx_stack.top
+    if ctx is None or not has_request_context():
+        return None
+
+    target = getattr(ctx, 'fbc_partial_target', False)
+    if target is False:
+        target = (request.headers.get(PARTIAL_HEADER)
+                  or request.args.get(PARTIAL_ARG)
+                  or None)
+        ctx.fbc_partial_target = target
+    return target
+
+def partial_render(method):
+    """Decorate rendering method of component to support partial
+    rendering."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        target = get_partial_target()
+        if target is None:
+            return method(self, *args, **kwargs)
+
+        name_prefix = getattr(self, "name_prefix", None)
+        if name_prefix == target:
+            _app_ctx_stack.top.fbc_partial_found = True
+            response = Response(method(self, *args, **kwargs),
+                                mimetype="text/html")
+            response.vary.add(PARTIAL_HEADER)
+            abort(response)
+
+        if name_prefix is not None and target.startswith(name_prefix + "__"):
+            return method(self, *args, **kwargs)
+
+        return Markup("")
+
+    return wrapper
+
+def add_vary_header(response):
+    """Responses differ by PARTIAL_HEADER, caches have to know that."""
+    if response.mimetype == "text/html":
+        response.vary.add(PARTIAL_HEADER)
+    return response
+
+def check_partial_found(response):
+    """Replace page rendered for partial request without finding requested
+    component (stale link, crafted URL) by 404 instead of gutted layout."""
+    if (get_partial_target() is not None
+        and not getattr(_app_ctx_stack.top, 'fbc_partial_found', False)
+        and response.status_code == 200
+        and response.mimetype == "text/html"):
+        response = NotFound().get_response()
+        response.vary.add(PARTIAL_HEADER)
+    return response
@@ -1,11 +1,64 @@
-from flask import render_template, request, url_for
-from markupsafe import Markup
-from .markup import element
-from .component import Component, InteractiveComponent, StateSlot, IntStateSlot
+from flask import request, stream_with_context, Response
+from markupsafe import Markup, escape
+import re
+from functools import lru_cache, partial
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, chain
+from operator import attrgetter, itemgetter
+from uuid import uuid4
+from .markup import static_element, static_xmltag
+from .utils import get_url_template, url_for
+from .instrumentation import instrumented, count_rows
+from .partial import partial_render
+from .parallel import get_executor, ordered_map, render_cells_chunk
+from .windows import is_window_request
+from .conditional import ResponseValidator, check_not_modified
+from .component import (
+    Component, InteractiveComponent, StateSlot, IntStateSlot,
+    OptionalStateSlot, BooleanStateSlot
+)
+from .datasources import (
+    KeysetDataSource, ListKeysetDataSource, SequenceAdapter
+)
 
 DEFAULT_CONTENT_MAP = {
 }
 
+def map_content(content_map, value):
+    """Return replacement of value from content_map, unhashable values are
+    never replaced."""
+    try:
+        if value in content_map:
+            return content_map[value]
+    except TypeError:
+        pass
+    return value
+
+def escape_many(values):
+    """Escape list of plain strings with single escape() call."""
+    if not values:
+        return []
+
+    joined = "\x00".join(values)
+    if joined.count("\x00") != len(values) - 1:
+        return [str(escape(i)) for i in values]
+
+    return str(escape(joined)).split("\x00")
+
+def is_async_iterable(data):
+    return hasattr(data, "__aiter__")
+
+def join_cells(columns, count):
+    """Join per-column lists of cell HTML into count rows."""
+    if not columns:
+        return [Markup("<tr></tr>")] * count
+    return [Markup("<tr>{}</tr>".format("".join(cells)))
+            for cells in zip(*columns)]
+
 class Column(object):
     def __init__(self, 
                  name, 
@@ -28,7 +81,27 @@ class Column(object):
             self.get_cell_data = data_proc
 
     def get_cell_html(self, row):
-        return element("td", self.td_attrs, self.get_cell_inner_html(row))
+        return static_element("td", self.td_attrs,
+                              self.get_cell_inner_html(row))
+
+    # Compiled accessors are closures that cannot be pickled (eg. for
+    # rendering on process pool), they are rebuilt from their paths
+    def _get_compiled_accessors(self):
+        res = {}
+        for cls in reversed(type(self).__mro__):
+            res.update(vars(cls).get("compiled_accessors", {}))
+        return res
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in self._get_compiled_accessors():
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name, path in self._get_compiled_accessors().items():
+            setattr(self, name, compile_accessor(getattr(self, path)))
 
     def convert(self, data):
         if data is True:
@@ -43,12 +116,128 @@ class Column(object):
     def get_cell_inner_html(self, row):
         res = self.get_cell_data(row)
         res = self.convert(res)
+        return map_content(self.content_map, res)
 
-        if res in self.content_map:
-            return self.content_map[res]
-        
+    def convert_many(self, values):
+        """Batch version of convert(), returns list of converted values.
+
+        Subclasses can override this with vectorized implementation.
+        """
+        convert = self.convert
+        return [convert(i) for i in values]
+
+    def get_contents_html_many(self, values):
+        """Convert, map and escape list of cell data values.
+
+        Returns list of escaped HTML strings. NumPy-like numeric arrays are
+        converted by single astype(str) call when column does not customize
+        conversion.
+        """
+        dtype = getattr(values, "dtype", None)
+        if (dtype is not None and dtype.kind in "iuf"
+            and not self.content_map
+            and "convert" not in self.__dict__
+            and type(self).convert is Column.convert
+            and type(self).convert_many is Column.convert_many):
+            # Numbers never need escaping
+            return values.astype(str).tolist()
+
+        res = self.convert_many(values)
+
+        content_map = self.content_map
+        if content_map:
+            return self.map_contents_html(content_map, res)
+
+        # Plain strings and numbers can be escaped all at once
+        if {type(i) for i in res} <= {str, int, float}:
+            return escape_many([str(i) for i in res])
+
+        return [escape(i) for i in res]
+
+    def map_contents_html(self, content_map, values):
+        """Map and escape converted values, memoizing result for each
+        distinct value within the batch."""
+        memo = {}
+        res = []
+        for i in values:
+            key = (type(i), i)
+            try:
+                html = memo[key]
+            except KeyError:
+                html = memo[key] = escape(map_content(content_map, i))
+            except TypeError:
+                html = escape(i)
+            res.append(html)
         return res
 
+    def get_value_cells_html(self, values):
+        """Return list of complete ``<td>`` elements for cell data values."""
+        cell = str(static_xmltag("td", self.td_attrs)).replace("%", "%%")
+        cell += "%s</td>"
+        return [cell % i for i in self.get_contents_html_many(values)]
+
+    def get_cells_html(self, rows):
+        """Batch version of get_cell_html(), returns list of escaped
+        ``<td>`` elements for rows."""
+        cls = type(self)
+        if (cls.get_cell_html is Column.get_cell_html
+            and cls.get_cell_inner_html is Column.get_cell_inner_html):
+            get_cell_data = self.get_cell_data
+            return self.get_value_cells_html([get_cell_data(i)
+                                              for i in rows])
+
+        cell_html = self.compile_cell_html()
+        return [cell_html(i) for i in rows]
+
+    def compile_cell_contents(self):
+        """Return function mapping row to escaped cell contents.
+
+        Compiled equivalent of Column.get_cell_inner_html(), with attribute
+        lookups hoisted out of the per-row path.
+        """
+        get_cell_data = self.get_cell_data
+        convert = self.convert
+        content_map = self.content_map
+
+        if not content_map:
+            return lambda row: escape(convert(get_cell_data(row)))
+
+        def cell_contents(row):
+            return escape(map_content(content_map, convert(get_cell_data(row))))
+
+        return cell_contents
+
+    def compile_cell_inner_html(self):
+        """Return function mapping row to escaped inner HTML of the cell.
+
+        Returns None when subclass customizes get_cell_inner_html() in a way
+        that compiled renderer cannot reproduce.
+        """
+        if type(self).get_cell_inner_html is not Column.get_cell_inner_html:
+            return None
+        return self.compile_cell_contents()
+
+    def compile_cell_html(self):
+        """Return function mapping row to complete escaped ``<td>`` element.
+
+        Falls back to calling get_cell_html() for each row when the column
+        cannot be compiled.
+        """
+        inner = None
+        if type(self).get_cell_html is Column.get_cell_html:
+            inner = self.compile_cell_inner_html()
+
+        if inner is None:
+            get_cell_html = self.get_cell_html
+            return lambda row: escape(get_cell_html(row))
+
+        opener = str(static_xmltag("td", self.td_attrs))
+
+        def cell_html(row):
+            return "".join((opener, inner(row), "</td>"))
+
+        return cell_html
+
     def get_header_html(self):
         return Markup('<th scope="col">{0}</th>').format(
             self.get_header_inner_html()
@@ -111,12 +300,66 @@ class SequenceColumn(Column):
     def get_cell_data(self, row):
         return row[self.index]
 
-def recursive_getattr(r, attr):
-    for i in attr.split('.'):
-        r = getattr(r, i)
-        if r is None:
+_PATH_STEP_RE = re.compile(r"""
+    \.?([^\W\d]\w*)                  # attribute
+  | \[\s*(-?[0-9]+)\s*\]            # index
+  | \[\s*(?:'([^']*)'|"([^"]*)"|([^\]'"]*?))\s*\]  # dict key
+""", re.VERBOSE)
+
+def parse_path(path):
+    """Split accessor path into list of ("attr", name) and ("item", key)
+    steps.
+
+    Path consists of dot separated attribute names, optionally followed by
+    ``[0]`` index or ``[key]`` (or quoted ``['key']``) dict key steps, eg.
+    ``customer.addresses[0].city`` or ``meta[author].name``.
+    """
+    steps = []
+    pos = 0
+    while pos < len(path):
+        m = _PATH_STEP_RE.match(path, pos)
+        if m is None or (m.group(1) and (pos > 0) != (path[pos] == ".")):
+            raise ValueError("Invalid accessor path {!r}".format(path))
+        attr, index, *keys = m.groups()
+        if attr is not None:
+            steps.append(("attr", attr))
+        elif index is not None:
+            steps.append(("item", int(index)))
+        else:
+            steps.append(("item", next(i for i in keys if i is not None)))
+        pos = m.end()
+    if not steps:
+        raise ValueError("Empty accessor path")
+    return steps
+
+def _step_getter(kind, value):
+    return attrgetter(value) if kind == "attr" else itemgetter(value)
+
+def _chain_getter(getter, rest):
+    def chained(row):
+        row = getter(row)
+        if row is None:
             return None
-    return r
+        return rest(row)
+    return chained
+
+@lru_cache(maxsize=1024)
+def compile_accessor(path):
+    """Return function reading value at path (see parse_path()) from row.
+
+    Like recursive_getattr(), None in the middle of the path yields None.
+    Each step is a plain attrgetter()/itemgetter() followed by None check,
+    so nullable relations cost no exception and no second walk.
+    """
+    getters = [_step_getter(*i) for i in parse_path(path)]
+
+    accessor = getters.pop()
+    while getters:
+        accessor = _chain_getter(getters.pop(), accessor)
+    return accessor
+
+def recursive_getattr(r, attr):
+    return compile_accessor(attr)(r)
 
 class FixedColumn(Column):
     def __init__(self, name, value, **kwargs):
@@ -129,19 +372,23 @@ class FixedColumn(Column):
 
 
 class ObjectColumn(Column): 
+    compiled_accessors = {"accessor": "attr"}
+
     def __init__(self, name, attr, **kwargs):
         super(ObjectColumn, self).__init__(name, attr=attr, **kwargs)
         self.attr = attr
         self.id = attr
+        self.accessor = compile_accessor(attr)
         
     def get_cell_data(self, row):
-        return recursive_getattr(row, self.attr)
+        return self.accessor(row)
 
 class ObjectOrNoneColumn(ObjectColumn):
+    """Object column showing None when path does not exist in row."""
     def get_cell_data(self, row):
         try:
-            return super(self, ObjectColumn).get_cell_data(row)
-        except:
+            return super().get_cell_data(row)
+        except (AttributeError, LookupError, TypeError):
             return None
 
 class LinkColumnMixin:
@@ -149,7 +396,44 @@ class LinkColumnMixin:
         return Markup('<a href="{}">{}</a>').format(self.href(row),
                                                     super().get_cell_inner_html(row))
 
+    def compile_cell_inner_html(self):
+        if type(self).get_cell_inner_html is not LinkColumnMixin.get_cell_inner_html:
+            return None
+
+        parent = super().get_cell_inner_html
+        if getattr(parent, "__func__", None) is Column.get_cell_inner_html:
+            contents = self.compile_cell_contents()
+        else:
+            contents = lambda row: escape(parent(row))
+        href = self.href
+
+        def cell_inner_html(row):
+            return '<a href="{}">{}</a>'.format(escape(href(row)),
+                                                contents(row))
+
+        return cell_inner_html
+
+    def get_cells_html(self, rows):
+        cls = type(self)
+        parent = super().get_cell_inner_html
+        if (cls.get_cell_html is not Column.get_cell_html
+            or cls.get_cell_inner_html is not LinkColumnMixin.get_cell_inner_html
+            or getattr(parent, "__func__", None) is not Column.get_cell_inner_html):
+            return super().get_cells_html(rows)
+
+        get_cell_data = self.get_cell_data
+        href = self.href
+        contents = self.get_contents_html_many([get_cell_data(i)
+                                                for i in rows])
+        hrefs = escape_many([str(href(i)) for i in rows])
+
+        cell = str(static_xmltag("td", self.td_attrs)).replace("%", "%%")
+        cell += '<a href="%s">%s</a></td>'
+        return [cell % i for i in zip(hrefs, contents)]
+
 class ObjectLinkColumnMixin(LinkColumnMixin):
+    compiled_accessors = {"id_accessor": "id_attr"}
+
     def __init__(self, name, endpoint,
                  id_attr='id', id_arg='id', additional_args={}, **kwargs):
         super().__init__(name,
@@ -157,14 +441,18 @@ class ObjectLinkColumnMixin(LinkColumnMixin):
                          id_arg=id_arg,
                          **kwargs)
         self.id_attr = id_attr
+        self.id_accessor = compile_accessor(id_attr)
         self.id_arg = id_arg
         self.endpoint = endpoint
         self.additional_args = additional_args
 
     def href(self, row):
-        args = dict(self.additional_args)
-        args[self.id_arg] = recursive_getattr(row, self.id_attr)
-        return url_for(self.endpoint, **args)
+        return self.url_template(self.id_accessor(row))
+
+    @property
+    def url_template(self):
+        return get_url_template(self.endpoint, self.id_arg,
+                                self.additional_args)
     
         
 class ObjectLinkColumn(ObjectLinkColumnMixin, ObjectColumn):
@@ -194,19 +482,34 @@ class ColumnsMixin(object):
         return i
 
 class BaseTable(ColumnsMixin, Component):
+    template = 'flask_bootstrap_components/internal/table.html'
+
     def __init__(self, 
                  columns=None, 
                  data=None,
                  classes=["table-striped"],
                  responsive=True,
+                 compiled=True,
+                 data_version=None,
+                 last_modified=None,
                  **kwargs):
 
+        self.compiled = compiled
+
         super().__init__(columns=columns,
                          data=data,
                          classes=classes,
                          responsive=responsive,
+                         compiled=compiled,
                          **kwargs)
 
+        # Version of data (eg. last change counter) enables answering
+        # conditional GET without rendering, see conditional module
+        if data_version is not None:
+            validator = ResponseValidator.get_instance()
+            if validator is not None:
+                validator.add_component(self, data_version, last_modified)
+
         if columns is not None:
             self.set_columns(columns)
         else:
@@ -232,17 +535,178 @@ class BaseTable(ColumnsMixin, Component):
 
     def set_columns(self, columns):
         self.columns = self.transform_columns(columns)        
-        
-    def __html__(self):
+
+    def iter_rows_html(self):
+        return count_rows(iter(self.data))
+
+    def column_header(self, column):
+        return column.header
+
+    def check_configuration(self):
         if self.data is None:
             raise ValueError("No data set for table")
         if self.columns is None:
             raise ValueError("Table does not have column configuration")
+
+    def check_async_configuration(self):
+        self.check_configuration()
         
-        return Markup(render_template('flask_bootstrap_components/internal/table.html',
-                                      table=self))
+    @partial_render
+    @instrumented
+    def __html__(self):
+        self.check_configuration()
+        return self.render_template(self.template, table=self)
+
+    def render_frame(self):
+        """Render table template without rows, returns HTML before and
+        after the rows."""
+        marker = "<!--fbc-rows-{}-->".format(uuid4().hex)
+        head, tail = self.render_template(self.template,
+                                          table=self,
+                                          rows_marker=Markup(marker)).split(marker)
+        return Markup(head), Markup(tail)
+
+    def iter_html(self, chunk_rows=500):
+        """Generate table HTML in chunks.
+
+        Yields everything up to the first row, then batches of at most
+        chunk_rows rendered rows and finally the rest of the template
+        (closing tags, pagination etc.). Can be used directly as a body of
+        streamed response or iterated over from a streamed template.
+        """
+        self.check_configuration()
+
+        head, tail = self.render_frame()
+        yield head
+
+        rows = self.iter_rows_html()
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            yield Markup("").join(chunk)
+
+        yield tail
+
+    def stream_response(self, chunk_rows=500, mimetype="text/html"):
+        """Return response streaming only this table, see iter_html()."""
+        # Has to happen before the response starts, not in the generator
+        check_not_modified()
+        return Response(stream_with_context(self.iter_html(chunk_rows)),
+                        mimetype=mimetype)
+
+    def iter_export_data(self, all_pages=False):
+        """Return iterator of data items to export.
+
+        Paged tables return only the current page unless all_pages is set.
+        """
+        return iter(self.data)
+
+    def iter_export_rows(self, all_pages=False):
+        """Generate lists of converted cell values without any markup."""
+        cells = [(i.get_cell_data, i.convert) for i in self.columns]
+        for item in self.iter_export_data(all_pages):
+            yield [convert(get_cell_data(item))
+                   for get_cell_data, convert in cells]
+
+    def iter_csv(self, all_pages=False, header=True, chunk_rows=500,
+                 **fmtparams):
+        """Generate CSV of table data in chunks of chunk_rows rows.
+
+        fmtparams are passed to csv.writer().
+        """
+        self.check_configuration()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, **fmtparams)
+        if header:
+            writer.writerow([str(i.name) for i in self.columns])
+
+        rows = self.iter_export_rows(all_pages)
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            writer.writerows([[str(j) if isinstance(j, Markup) else j
+                               for j in i]
+                              for i in chunk])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def iter_ndjson(self, all_pages=False, chunk_rows=500):
+        """Generate newline delimited JSON objects keyed by column names in
+        chunks of chunk_rows rows."""
+        self.check_configuration()
+
+        names = [str(i.name) for i in self.columns]
+        encoder = json.JSONEncoder(default=str, ensure_ascii=False)
+        rows = self.iter_export_rows(all_pages)
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            yield "".join([encoder.encode(dict(zip(names, i))) + "\n"
+                           for i in chunk])
+
+    export_formats = {
+        "csv": ("iter_csv", "text/csv"),
+        "ndjson": ("iter_ndjson", "application/x-ndjson"),
+    }
+
+    def export_response(self, format="csv", all_pages=False, filename=None,
+                        **kwargs):
+        """Return response streaming table data as CSV or NDJSON."""
+        method, mimetype = self.export_formats[format]
+        response = Response(
+            stream_with_context(getattr(self, method)(all_pages=all_pages,
+                                                      **kwargs)),
+            mimetype=mimetype
+        )
+        if filename is not None:
+            response.headers.set("Content-Disposition", "attachment",
+                                 filename=filename)
+        return response
+
+    async def aiter_rows_html(self, chunk_rows=500):
+        """Asynchronously generate lists of at most chunk_rows rendered
+        rows."""
+        rows = self.iter_rows_html()
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            yield chunk
+
+    async def aiter_html(self, chunk_rows=500):
+        """Asynchronous counterpart of iter_html().
+
+        Tables with async data sources fetch their rows with ``async for``,
+        so the event loop is not blocked while waiting for them. The
+        generator can be returned as a body of streamed response by ASGI
+        frameworks. Template is rendered synchronously, it has to run in
+        application context like render_template() does.
+        """
+        self.check_async_configuration()
+
+        head, tail = self.render_frame()
+        yield head
+
+        async for chunk in self.aiter_rows_html(chunk_rows):
+            yield Markup("").join(chunk)
+
+        yield tail
+
+    async def render_async(self):
+        """Asynchronous counterpart of __html__()."""
+        return Markup("").join([i async for i in self.aiter_html()])
     
 class TableRow(object):
+    __slots__ = ["data", "columns"]
+
     def __init__(self, data, columns):
         self.data = data
         self.columns = columns
@@ -254,9 +718,9 @@ class TableRow(object):
         return Markup("").join(cols)
 
     def __html__(self):
-        return element("tr", 
-                       self.get_element_attrs(), 
-                       self.get_row_contents())
+        return static_element("tr",
+                              self.get_element_attrs(),
+                              self.get_row_contents())
 
     def get_element_attrs(self):
         classes = " ".join(self.get_element_classes())
@@ -279,22 +743,171 @@ class IterableDataTable(BaseTable):
     def __init__(self,
                  row_factory=None,
                  row_kwargs={},
+                 lazy=False,
+                 batch_rows=1000,
+                 parallel=None,
+                 workers=None,
+                 parallel_threshold=20000,
+                 parallel_chunk_rows=5000,
                  **kwargs):
         if row_factory:
             self.row_factory = row_factory
         else:
             self.row_factory = TableRow
         self.row_kwargs = row_kwargs
+        self.lazy = lazy
+        self.batch_rows = batch_rows
+
+        # Opt-in rendering of large tables on "thread" or "process" pool
+        # (or given Executor), see iter_parallel_rows_html()
+        self.parallel = parallel
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.parallel_chunk_rows = parallel_chunk_rows
         
         super().__init__(row_factory=row_factory,
                          row_kwargs=row_kwargs,
+                         lazy=lazy,
+                         batch_rows=batch_rows,
+                         parallel=parallel,
+                         workers=workers,
+                         parallel_threshold=parallel_threshold,
+                         parallel_chunk_rows=parallel_chunk_rows,
                          **kwargs)
 
     def transform_data(self, data):
+        # In lazy mode data is kept as is and consumed only while rendering,
+        # so any iterable (DB cursor, generator) can be passed without
+        # materializing it. Async iterables are always consumed lazily by
+        # aiter_html() or render_async().
+        if self.lazy or is_async_iterable(data):
+            return data
+
         return [self.row_factory(i, self.columns,
                                  **self.row_kwargs)
                 for i in data]
 
+    def check_configuration(self):
+        super().check_configuration()
+        if is_async_iterable(self.data):
+            raise TypeError("Table has async data source, "
+                            "render it using render_async() or aiter_html()")
+
+    def check_async_configuration(self):
+        BaseTable.check_configuration(self)
+
+    @property
+    def uses_batches(self):
+        # Compiled renderer replaces TableRow.__html__, so it can only be
+        # used with stock row class
+        return self.compiled and self.row_factory is TableRow
+
+    def iter_rows(self):
+        if not self.lazy:
+            return iter(self.data)
+
+        row_factory = self.row_factory
+        columns = self.columns
+        row_kwargs = self.row_kwargs
+        return (row_factory(i, columns, **row_kwargs) for i in self.data)
+
+    def iter_rows_html(self):
+        if not self.uses_batches:
+            return count_rows(self.iter_rows())
+
+        if self.parallel is not None:
+            return count_rows(self.iter_parallel_rows_html())
+
+        return count_rows(self.iter_batched_rows_html())
+
+    def iter_items(self):
+        if self.lazy:
+            return iter(self.data)
+        return (i.data for i in self.data)
+
+    def iter_export_data(self, all_pages=False):
+        return self.iter_items()
+
+    def render_batch(self, batch):
+        """Return list of rendered rows for list of data items."""
+        if not self.uses_batches:
+            row_factory = self.row_factory
+            columns = self.columns
+            row_kwargs = self.row_kwargs
+            return [row_factory(i, columns, **row_kwargs) for i in batch]
+
+        # Rows are rendered by whole columns, see Column.get_cells_html()
+        return join_cells([i.get_cells_html(batch) for i in self.columns],
+                          len(batch))
+
+    def iter_batched_rows_html(self, items=None):
+        if items is None:
+            items = self.iter_items()
+
+        while True:
+            batch = list(islice(items, self.batch_rows))
+            if not batch:
+                break
+            yield from self.render_batch(batch)
+
+    def iter_parallel_rows_html(self):
+        """Render chunks of parallel_chunk_rows rows on executor and yield
+        rows in order.
+
+        Tables with less than parallel_threshold rows are rendered in
+        current thread. Thread pools render in copies of current Flask
+        context, so any column works, but only free-threaded builds of
+        CPython render in parallel. Process pools need picklable rows and
+        columns that render without Flask context (no link columns).
+        """
+        items = self.iter_items()
+        head = list(islice(items, self.parallel_threshold))
+        if len(head) < self.parallel_threshold:
+            yield from self.iter_batched_rows_html(iter(head))
+            return
+
+        items = chain(head, items)
+        chunk_rows = self.parallel_chunk_rows
+
+        # First chunk is rendered here, which also warms up caches (URL
+        # templates, static tags) shared with worker threads
+        yield from self.iter_batched_rows_html(islice(items, chunk_rows))
+
+        def chunks():
+            while True:
+                chunk = list(islice(items, chunk_rows))
+                if not chunk:
+                    break
+                yield chunk
+
+        executor = get_executor(self.parallel, self.workers)
+        window = 2 * (self.workers or os.cpu_count() or 1)
+        if isinstance(executor, ProcessPoolExecutor):
+            func = partial(render_cells_chunk, self.columns)
+            results = ordered_map(executor, func, chunks(), window)
+            for rows in results:
+                yield from map(Markup, rows)
+        else:
+            results = ordered_map(executor, self.render_batch, chunks(),
+                                  window, copy_context=True)
+            for rows in results:
+                yield from rows
+
+    async def aiter_rows_html(self, chunk_rows=500):
+        if not is_async_iterable(self.data):
+            async for i in super().aiter_rows_html(chunk_rows):
+                yield i
+            return
+
+        batch = []
+        async for i in self.data:
+            batch.append(i)
+            if len(batch) >= chunk_rows:
+                yield self.render_batch(batch)
+                batch = []
+        if batch:
+            yield self.render_batch(batch)
+
     @property
     def column_headers(self):
         return self.columns
@@ -322,6 +935,8 @@ class ObjectTable(ObjectColumnMixin, IterableDataTable):
                          **kwargs)
 
 class GroupHeaderRow(TableRow):
+    __slots__ = ["content_accessor"]
+
     def __init__(self, data, columns, content_accessor):
         self.data = data
         self.columns = columns
@@ -348,8 +963,9 @@ class GroupHeaderTable(PlainTable):
                          **kwargs)
 
 class PagedTable(PlainTable, InteractiveComponent):
+    template = 'flask_bootstrap_components/internal/paged_table.html'
 
-    per_page = IntStateSlot(100)
+    per_page = IntStateSlot(100, minimum=1)
     cur_page = IntStateSlot(0)
     
     def __init__(self,
@@ -358,12 +974,17 @@ class PagedTable(PlainTable, InteractiveComponent):
                  per_page_options=[10, 50, 100],
                  anchor=None, # For backward compatibility
                  name=None,
+                 row_count=None,
+                 window=3,
                  **kwargs):
         
         if anchor is not None: 
             name = anchor
 
         self.per_page_options = per_page_options
+        self.row_count = row_count
+        self.window = window
+        self.total_rows = None
             
         super().__init__(columns=columns,
                          data=None,
@@ -376,15 +997,63 @@ class PagedTable(PlainTable, InteractiveComponent):
             self.set_data(data)
 
     def set_data(self, data):
-        data = data[self.cur_page*self.per_page
-                    : (self.cur_page+1)*self.per_page]
-        self.has_next = len(data) == self.per_page
-        super().set_data(data)
-        
-    def __html__(self):
-        return Markup(render_template('flask_bootstrap_components/internal/paged_table.html',
-                                      table=self))
-        
+        if self.row_count is not None:
+            self.total_rows = self.row_count.count(data)
+
+        # Kept for exporting all pages
+        self.all_data = data
+
+        # One extra row tells whether there is next page
+        start = self.cur_page * self.per_page
+        data = data[start : start + self.per_page + 1]
+        self.has_next = len(data) > self.per_page
+        super().set_data(data[:self.per_page])
+
+    def iter_export_data(self, all_pages=False):
+        if all_pages:
+            return iter(self.all_data)
+        return super().iter_export_data()
+
+    @property
+    def page_count(self):
+        if self.total_rows is None:
+            return None
+        return max(-(-self.total_rows // self.per_page), 1)
+
+    @property
+    def page_window(self):
+        """Page numbers to show links for, None stands for gap.
+
+        Contains first page, window pages around current one and last page
+        when total row count is known.
+        """
+        cur_page = self.cur_page
+        page_count = self.page_count
+
+        first = max(cur_page - self.window, 0)
+        if page_count is not None:
+            last = max(min(cur_page + self.window, page_count - 1), cur_page)
+        else:
+            last = cur_page + 1 if self.has_next else cur_page
+
+        res = []
+        if first > 0:
+            res.append(0)
+            if first > 1:
+                res.append(None)
+
+        res.extend(range(first, last + 1))
+
+        if page_count is None:
+            if self.has_next:
+                res.append(None)
+        elif last < page_count - 1:
+            if last < page_count - 2:
+                res.append(None)
+            res.append(page_count - 1)
+
+        return res
+
     def page_url(self, page):
         return self.build_url(cur_page=page)
 
@@ -393,3 +1062,371 @@ class PagedTable(PlainTable, InteractiveComponent):
         return self.build_url(cur_page=page,
                               per_page=per_page)
     
+
+class SortablePagedTable(PagedTable):
+    """Paged table sorted by column and filtered by search terms on server.
+
+    Sorting and filtering is pushed down to data by adapter (see
+    TableDataAdapter), by default SequenceAdapter for in-memory sequences.
+    sortable and filterable restrict columns (by column id) offered for
+    sorting and searched by filter, all columns supported by adapter are
+    used by default.
+    """
+    template = 'flask_bootstrap_components/internal/sortable_paged_table.html'
+
+    sort = OptionalStateSlot()
+    descending = BooleanStateSlot(False)
+    search = OptionalStateSlot()
+
+    def __init__(self,
+                 columns=None,
+                 data=None,
+                 adapter=None,
+                 sortable=None,
+                 filterable=None,
+                 **kwargs):
+        if adapter is None:
+            adapter = SequenceAdapter()
+        self.adapter = adapter
+        self.sortable = sortable
+        self.filterable = filterable
+
+        super().__init__(columns=columns,
+                         data=data,
+                         **kwargs)
+
+    def is_sortable(self, column):
+        return ((self.sortable is None or column.id in self.sortable)
+                and self.adapter.can_sort(column))
+
+    def is_filterable(self, column):
+        return ((self.filterable is None or column.id in self.filterable)
+                and self.adapter.can_filter(column))
+
+    @property
+    def sort_column(self):
+        for i in self.columns:
+            if i.id == self.sort and self.is_sortable(i):
+                return i
+        return None
+
+    @property
+    def search_terms(self):
+        if not self.search:
+            return []
+        return self.search.split()
+
+    @property
+    def filter_columns(self):
+        return [i for i in self.columns if self.is_filterable(i)]
+
+    def set_data(self, data):
+        terms = self.search_terms
+        columns = self.filter_columns
+        if terms and columns:
+            data = self.adapter.filter(data, columns, terms)
+
+        column = self.sort_column
+        if column is not None:
+            data = self.adapter.sort(data, column, self.descending)
+
+        super().set_data(data)
+
+    def sort_url(self, column):
+        descending = (column is self.sort_column and not self.descending)
+        return self.build_url(sort=column.id,
+                              descending=descending,
+                              cur_page=0)
+
+    def column_header(self, column):
+        if not self.is_sortable(column):
+            return column.header
+
+        attrs = {"scope": "col"}
+        indicator = ""
+        if column is self.sort_column:
+            if self.descending:
+                attrs["aria-sort"] = "descending"
+                indicator = Markup(" &#9660;")
+            else:
+                attrs["aria-sort"] = "ascending"
+                indicator = Markup(" &#9650;")
+
+        return static_element("th", attrs,
+                              Markup('<a href="{}" data-fbc-partial="{}">'
+                                     '{}</a>{}')
+                              .format(self.sort_url(column),
+                                      self.name_prefix,
+                                      column.get_header_inner_html(),
+                                      indicator))
+
+    @property
+    def search_argument(self):
+        return self.state.convert_argument_name("search")
+
+    @property
+    def search_form_action(self):
+        return url_for(request.endpoint, **(request.view_args or {}))
+
+    @property
+    def search_form_args(self):
+        """Current URL arguments to be preserved by search form."""
+        skip = {self.search_argument,
+                self.state.convert_argument_name("cur_page")}
+        skip.update(request.view_args or {})
+        return [(k, v) for k, v in self.state.get_base_args().items()
+                if k not in skip]
+
+class KeysetPagedTable(PlainTable, InteractiveComponent):
+    """Paged table fetching pages relative to key of neighbouring page.
+
+    Data has to be a KeysetDataSource (or sequence sorted by key, which is
+    then wrapped in ListKeysetDataSource, key function or attribute name
+    is required then).
+    """
+    template = 'flask_bootstrap_components/internal/keyset_paged_table.html'
+
+    per_page = IntStateSlot(100, minimum=1)
+    after_key = OptionalStateSlot()
+    before_key = OptionalStateSlot()
+
+    def __init__(self,
+                 columns=None,
+                 data=None,
+                 key=None,
+                 key_type=None,
+                 per_page_options=[10, 50, 100],
+                 **kwargs):
+        self.key = key
+        self.key_type = key_type
+        self.per_page_options = per_page_options
+
+        super().__init__(columns=columns,
+                         data=None,
+                         per_page_options=per_page_options,
+                         state_defaults=self.defaults_from_kwargs(**kwargs),
+                         **kwargs)
+
+        if data is not None:
+            self.set_data(data)
+
+    def set_data(self, data):
+        if not isinstance(data, KeysetDataSource):
+            if self.key is None:
+                raise ValueError("KeysetPagedTable needs key to page "
+                                 "sequence data")
+            data = ListKeysetDataSource(data, self.key, self.key_type)
+        self.source = data
+
+        rows = None
+        if self.before_key is not None:
+            rows = self.fetch_before(data.load_key(self.before_key))
+        elif self.after_key is not None:
+            after = data.load_key(self.after_key)
+            rows = self.fetch_after(after)
+            if not rows:
+                # Key past the last row (stale link, deleted rows), show
+                # the last page instead
+                rows = self.fetch_before(after)
+                self.has_next = False
+
+        if not rows:
+            rows = self.fetch_after(None)
+
+        self.first_key = data.key_of(rows[0]) if rows else None
+        self.last_key = data.key_of(rows[-1]) if rows else None
+        super().set_data(rows)
+
+    def fetch_before(self, key):
+        per_page = self.per_page
+        rows = self.source.fetch_before(key, per_page + 1)
+        self.has_prev = len(rows) > per_page
+        self.has_next = True
+        return rows[-per_page:]
+
+    def fetch_after(self, key):
+        per_page = self.per_page
+        rows = self.source.fetch_after(key, per_page + 1)
+        self.has_prev = key is not None
+        self.has_next = len(rows) > per_page
+        return rows[:per_page]
+
+    def iter_export_data(self, all_pages=False):
+        if not all_pages:
+            yield from super().iter_export_data()
+            return
+
+        source = self.source
+        key = None
+        while True:
+            rows = source.fetch_after(key, self.per_page)
+            yield from rows
+            if len(rows) < self.per_page:
+                break
+            key = source.key_of(rows[-1])
+
+    def first_page_url(self):
+        return self.build_url(after_key=None, before_key=None)
+
+    def next_page_url(self):
+        return self.build_url(after_key=self.source.dump_key(self.last_key),
+                              before_key=None)
+
+    def prev_page_url(self):
+        return self.build_url(after_key=None,
+                              before_key=self.source.dump_key(self.first_key))
+
+    def per_page_url(self, per_page):
+        return self.build_url(per_page=per_page)
+
+class WindowedTable(PlainTable, InteractiveComponent):
+    """Table rendering only first window_rows rows of data.
+
+    Further windows are fetched while scrolling from row window endpoint,
+    table has to be registered with FlaskBootstrapComponents.row_window()
+    under its name_prefix. Data has to support slicing (sequences,
+    SQLAlchemy queries), only rows of requested window are fetched.
+
+    When built by row_window() factory for window request, set_data() only
+    keeps the data, the endpoint then loads requested window.
+    """
+    template = 'flask_bootstrap_components/internal/windowed_table.html'
+
+    def __init__(self,
+                 columns=None,
+                 data=None,
+                 window_rows=100,
+                 max_window_rows=1000,
+                 row_count=None,
+                 **kwargs):
+        self.window_rows = window_rows
+        self.max_window_rows = max_window_rows
+        self.row_count = row_count
+        self.total_rows = None
+
+        super().__init__(columns=columns,
+                         data=None,
+                         window_rows=window_rows,
+                         state_defaults=self.defaults_from_kwargs(**kwargs),
+                         **kwargs)
+
+        if data is not None:
+            self.set_data(data)
+
+    def set_data(self, data):
+        self.source = data
+        if is_window_request(self.name_prefix):
+            return
+
+        if self.row_count is not None:
+            self.total_rows = self.row_count.count(data)
+        self.load_window(0, self.window_rows)
+
+    def load_window(self, start, count):
+        # One extra row tells whether there are more rows
+        rows = self.source[start : start + count + 1]
+        self.window_start = start
+        self.has_more = len(rows) > count
+        super().set_data(rows[:count])
+
+    @property
+    def window_url(self):
+        return url_for("flask_bootstrap_components.row_window",
+                       name_prefix=self.name_prefix,
+                       **self.state.slot_args())
+
+class ColumnarRow(object):
+    """View of one row of columnar data, allows columns that need whole row
+    (links, custom accessors) to be used with ColumnarTable."""
+    __slots__ = ["table", "index"]
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.table.get_column_values(key)[self.index]
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except (KeyError, IndexError):
+            raise AttributeError(name)
+
+class ColumnarTable(SequenceColumnMixin, BaseTable):
+    """Table with column oriented data.
+
+    Data is either mapping of column keys to sequences of values (lists,
+    NumPy arrays, ...) or sequence of such column sequences. SequenceColumn
+    index and ObjectColumn attr select data column by key (or position),
+    values of such columns are converted and escaped by whole batches.
+    Other columns get row views of the data.
+    """
+    def __init__(self,
+                 columns=None,
+                 data=None,
+                 batch_rows=1000,
+                 **kwargs):
+        self.batch_rows = batch_rows
+        super().__init__(columns=columns,
+                         data=data,
+                         batch_rows=batch_rows,
+                         **kwargs)
+
+    def transform_data(self, data):
+        if not hasattr(data, "keys"):
+            data = dict(enumerate(data))
+        self.column_keys = list(data.keys())
+
+        lengths = {len(i) for i in data.values()}
+        if len(lengths) > 1:
+            raise ValueError("Data columns have different lengths")
+        self.num_rows = lengths.pop() if lengths else 0
+
+        return data
+
+    def get_column_values(self, key):
+        if key in self.data:
+            return self.data[key]
+        if not isinstance(key, int):
+            raise KeyError(key)
+        return self.data[self.column_keys[key]]
+
+    def get_column_key(self, column):
+        """Return data key of column values or None when column needs whole
+        rows."""
+        cls = type(column)
+        if (cls.get_cell_html is not Column.get_cell_html
+            or cls.get_cell_inner_html is not Column.get_cell_inner_html):
+            return None
+
+        if cls.get_cell_data is SequenceColumn.get_cell_data:
+            return column.index
+        if cls.get_cell_data is ObjectColumn.get_cell_data:
+            if parse_path(column.attr) == [("attr", column.attr)]:
+                return column.attr
+        return None
+
+    def render_batch(self, start, end):
+        columns = []
+        for i in self.columns:
+            key = self.get_column_key(i)
+            if key is not None:
+                values = self.get_column_values(key)[start:end]
+                columns.append(i.get_value_cells_html(values))
+            else:
+                columns.append(i.get_cells_html([ColumnarRow(self, j)
+                                                 for j in range(start, end)]))
+
+        return join_cells(columns, end - start)
+
+    def iter_columnar_rows_html(self):
+        for start in range(0, self.num_rows, self.batch_rows):
+            end = min(start + self.batch_rows, self.num_rows)
+            yield from self.render_batch(start, end)
+
+    def iter_rows_html(self):
+        return count_rows(self.iter_columnar_rows_html())
+
+    def iter_export_data(self, all_pages=False):
+        return (ColumnarRow(self, i) for i in range(self.num_rows))
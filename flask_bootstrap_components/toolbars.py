@@ -1,6 +1,9 @@
 from .utils import url_or_url_for
 from .buttons import link_button
-from .markup import element
+from .markup import static_element
+from .fragment_cache import render_cached
+from .instrumentation import instrumented
+from .partial import partial_render
 from markupsafe import Markup
 
 class ToolbarButton(object):
@@ -15,6 +18,12 @@ class ToolbarButton(object):
         self.args = args
         self.pass_args = pass_args 
 
+    @property
+    def definition_key(self):
+        return (type(self), str(self.text), self.endpoint, self.context_class,
+                str(self.hint), tuple(sorted(self.args.items())),
+                tuple(self.pass_args))
+
     def render(self, toolbar, size, args={}):
         a = dict(self.args)
         for i in self.pass_args:
@@ -28,6 +37,8 @@ class ToolbarButton(object):
                            self.hint)
 
 class ToolbarSplitter(object):
+    definition_key = "splitter"
+
     def render(self, toolbar, size, args={}):
         return Markup('</div><div class="btn-group" role="group">')
     
@@ -49,16 +60,28 @@ class Toolbar(object):
         self.buttons.append(ToolbarSplitter())
         self.grouped = True
 
+    def fragment_cache_key(self, size, in_group=False, args={}):
+        passed = {j for i in self.buttons for j in getattr(i, "pass_args", ())}
+        return (type(self), self.grouped, size, in_group,
+                tuple(i.definition_key for i in self.buttons),
+                tuple(sorted((i, args.get(i)) for i in passed)))
+
+    @partial_render
+    @instrumented
     def render(self, size, in_group=False, **kwargs):
+        return render_cached(self, self.render_uncached, size,
+                             in_group=in_group, **kwargs)
+
+    def render_uncached(self, size, in_group=False, **kwargs):
         res = Markup("").join((i.render(self, size, **kwargs)
                                for i in self.buttons))
 
         if not in_group:
             if self.grouped:
-                res = element("div", {"class": "btn-group"}, res)
-                res = element("div", {"class": "btn-toolbar"}, res)
+                res = static_element("div", {"class": "btn-group"}, res)
+                res = static_element("div", {"class": "btn-toolbar"}, res)
             else:
-                res = element("div", {}, res)
+                res = static_element("div", {}, res)
             
         return res
         
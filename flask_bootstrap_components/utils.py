@@ -1,7 +1,143 @@
-from flask import url_for
+import flask
+from flask import (
+    current_app, stream_with_context, request, has_request_context,
+    _request_ctx_stack
+)
+from uuid import UUID
+from . import instrumentation
+
+def url_for(endpoint, **values):
+    """flask.url_for() counted by render instrumentation."""
+    if instrumentation.enabled:
+        instrumentation.count_url_for()
+    return flask.url_for(endpoint, **values)
 
 def url_or_url_for(url, **kwargs):
     if '/' in url:
         return url.format(**kwargs)
     else:
         return url_for(url, **kwargs)
+
+def stream_template(template_name, **context):
+    """Render template as generator of chunks wrapped in stream_with_context.
+
+    Components providing iter_html() can be streamed from such template
+    using ``{%for i in table.iter_html()%}{{i}}{%endfor%}``.
+    """
+    app = current_app._get_current_object()
+    app.update_template_context(context)
+    template = app.jinja_env.get_template(template_name)
+    return stream_with_context(template.generate(context))
+
+def get_rule_converter(endpoint, arg):
+    """Return converter of URL rule argument when URL for endpoint can be
+    safely built by substituting just that argument, None otherwise."""
+    app = current_app
+
+    # URL defaults callbacks can modify values depending on the argument
+    if any(app.url_default_functions.values()):
+        return None
+
+    if endpoint[:1] == ".":
+        blueprint = request.blueprint if has_request_context() else None
+        if blueprint is not None:
+            endpoint = blueprint + endpoint
+        else:
+            endpoint = endpoint[1:]
+
+    try:
+        rules = list(app.url_map.iter_rules(endpoint))
+    except KeyError:
+        return None
+
+    # With multiple rules url_for() can pick different rule depending on
+    # the value
+    if len(rules) != 1:
+        return None
+
+    rule = rules[0]
+    if arg not in rule.arguments:
+        return None
+    if rule.defaults and arg in rule.defaults:
+        return None
+
+    return getattr(rule, "_converters", {}).get(arg)
+
+class URLTemplate:
+    """URL of an endpoint with one rule argument left to be filled in.
+
+    Calling the template with a value returns the same URL as url_for(), but
+    only that value is passed through its rule converter. Endpoints that
+    cannot be templated (and values the converter rejects) fall back to
+    url_for().
+    """
+    probes = ("fbcurltemplateprobe",
+              907162534433,
+              UUID("f7b3c1d2-9a8e-4c5b-b6a7-0e1d2c3b4a59"))
+
+    def __init__(self, endpoint, arg, values={}):
+        self.endpoint = endpoint
+        self.arg = arg
+        self.values = values
+        self.converter = None
+        self.prefix = None
+        self.suffix = None
+        self.compile()
+
+    def compile(self):
+        converter = get_rule_converter(self.endpoint, self.arg)
+        if converter is None:
+            return
+
+        for probe in self.probes:
+            try:
+                encoded = converter.to_url(probe)
+                url = self.build(probe)
+            except Exception:
+                continue
+
+            if url.count(encoded) == 1:
+                self.prefix, self.suffix = url.split(encoded)
+                self.converter = converter
+                return
+
+    def build(self, value):
+        args = dict(self.values)
+        args[self.arg] = value
+        return url_for(self.endpoint, **args)
+
+    def __call__(self, value):
+        if self.converter is not None and value is not None:
+            try:
+                encoded = self.converter.to_url(value)
+            except Exception:
+                pass
+            else:
+                return self.prefix + encoded + self.suffix
+
+        return self.build(value)
+
+def get_url_template(endpoint, arg, values={}):
+    """Return URLTemplate cached for the current request.
+
+    Templates depend on request (blueprint of relative endpoints, host of
+    external URLs), so they are cached on request context.
+    """
+    ctx = _request_ctx_stack.top
+    if ctx is None:
+        return URLTemplate(endpoint, arg, values)
+
+    if not hasattr(ctx, 'fbc_url_templates'):
+        ctx.fbc_url_templates = {}
+
+    try:
+        key = (endpoint, arg, tuple(sorted(values.items())))
+        hash(key)
+    except TypeError:
+        return URLTemplate(endpoint, arg, values)
+
+    template = ctx.fbc_url_templates.get(key)
+    if template is None:
+        template = URLTemplate(endpoint, arg, values)
+        ctx.fbc_url_templates[key] = template
+    return template
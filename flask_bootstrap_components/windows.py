@@ -0,0 +1,49 @@
+"""Endpoint serving row windows of WindowedTable for virtual scrolling.
+
+Tables are looked up by name_prefix among factories registered with
+FlaskBootstrapComponents.row_window(). Factory is called in the window
+request, whose arguments carry state slot values of the table, so the
+table is configured the same way as on the page.
+
+Window requests do not pass through the view of the page, so factories
+(or decorators given to row_window()) have to do the same authorization.
+"""
+import json
+from flask import request, abort, Response
+from markupsafe import Markup
+from .base import get_extension_object
+
+ROW_WINDOW_ENDPOINT = "flask_bootstrap_components.row_window"
+
+def is_window_request(name_prefix):
+    """Return whether current request is row window request of component
+    with name_prefix."""
+    return (request.endpoint == ROW_WINDOW_ENDPOINT
+            and (request.view_args or {}).get("name_prefix") == name_prefix)
+
+def render_window(factory):
+    table = factory()
+    start = max(request.args.get("start", 0, type=int), 0)
+    count = request.args.get("count", table.window_rows, type=int)
+    count = min(max(count, 0), table.max_window_rows)
+    table.load_window(start, count)
+
+    if request.args.get("format") == "json":
+        # Same as NDJSON export, values JSON does not know become strings
+        body = json.dumps({"start": start,
+                           "has_more": table.has_more,
+                           "columns": [str(i.name) for i in table.columns],
+                           "rows": list(table.iter_export_rows())},
+                          default=str, ensure_ascii=False)
+        return Response(body, mimetype="application/json")
+
+    response = Response(Markup("").join(table.iter_rows_html()),
+                        mimetype="text/html")
+    response.headers["X-FBC-Has-More"] = "1" if table.has_more else "0"
+    return response
+
+def row_window_view(name_prefix):
+    view = get_extension_object().window_tables.get(name_prefix)
+    if view is None:
+        abort(404)
+    return view()
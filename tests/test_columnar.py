@@ -0,0 +1,31 @@
+"""Row views of ColumnarTable behave like rows of objects or sequences."""
+import pytest
+from flask import Flask
+
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.tables import (
+    ColumnarTable, ColumnarRow, ObjectColumn
+)
+
+@pytest.fixture
+def table():
+    app = Flask(__name__)
+    FlaskBootstrapComponents(app)
+    with app.test_request_context():
+        yield ColumnarTable(columns=[ObjectColumn("A", "a")],
+                            data={"a": [1, 2], "b": ["x", "y"]})
+
+def test_row_access(table):
+    row = ColumnarRow(table, 1)
+    assert row.a == 2
+    assert row["b"] == "y"
+    assert row[1] == "y"
+
+def test_missing_attribute(table):
+    row = ColumnarRow(table, 0)
+    assert not hasattr(row, "zz")
+    assert getattr(row, "zz", None) is None
+    with pytest.raises(KeyError):
+        row["zz"]
+    with pytest.raises(AttributeError):
+        ColumnarRow(table, 5).a
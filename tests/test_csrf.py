@@ -0,0 +1,27 @@
+"""Scoped auth keys must be bound to endpoint of the current request."""
+from flask import Flask, request
+
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.csrf import (
+    get_scoped_auth_key, check_scoped_auth_key
+)
+
+def test_endpoint_per_request():
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test'
+    FlaskBootstrapComponents(app)
+
+    @app.route('/a')
+    def a():
+        return get_scoped_auth_key("form")
+
+    @app.route('/b')
+    def b():
+        key = request.args["key"]
+        return "ok" if check_scoped_auth_key(key, "form") else "bad"
+
+    client = app.test_client()
+    with app.app_context():
+        key = client.get('/a').get_data(as_text=True)
+        res = client.get('/b', query_string={"key": key})
+        assert res.get_data(as_text=True) == "bad"
@@ -0,0 +1,35 @@
+"""Keyset pagination over sequences."""
+import pytest
+from flask import Flask
+
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.tables import KeysetPagedTable
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    FlaskBootstrapComponents(app)
+    app.add_url_rule("/", "index", lambda: "")
+    return app
+
+def make_table():
+    return KeysetPagedTable(["A"], [[i] for i in range(25)],
+                            key=lambda r: r[0], name="k", per_page=10)
+
+def test_key_required(app):
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            KeysetPagedTable(["A"], [[1]])
+
+def test_key_past_end_shows_last_page(app):
+    with app.test_request_context("/?k__after_key=100"):
+        table = make_table()
+        assert (table.first_key, table.last_key) == (15, 24)
+        assert table.has_prev and not table.has_next
+        assert "None" not in table.prev_page_url()
+
+def test_per_page_clamped(app):
+    with app.test_request_context("/?k__per_page=0"):
+        table = make_table()
+        assert table.per_page == 1
+        assert (table.first_key, table.last_key) == (0, 0)
@@ -0,0 +1,75 @@
+"""Minified internal templates must render the same DOM as the originals.
+
+DOM is compared without comments and whitespace-only text nodes, with
+whitespace in text collapsed.
+"""
+from html.parser import HTMLParser
+
+import pytest
+
+from flask_bootstrap_components.minify import minify_template
+
+from benchmarks.minify import TABLES, make_app, render
+
+class DOMParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = [(k, " ".join(v.split()) if v is not None else v)
+                 for k, v in attrs]
+        self.events.append(("start", tag, tuple(attrs)))
+
+    def handle_endtag(self, tag):
+        self.events.append(("end", tag))
+
+    def handle_data(self, data):
+        data = " ".join(data.split())
+        if data:
+            if self.events and self.events[-1][0] == "text":
+                data = self.events.pop()[1] + " " + data
+            self.events.append(("text", data))
+
+def dom(html):
+    parser = DOMParser()
+    parser.feed(html)
+    parser.close()
+    return parser.events
+
+@pytest.mark.parametrize("name", sorted(TABLES))
+@pytest.mark.parametrize("path", [
+    "/",
+    "/?paged__cur_page=3&sortable__cur_page=2&sortable__sort=1"
+    "&sortable__descending=1",
+    "/?keyset__after_key=100",
+])
+def test_same_dom(name, path):
+    factory = TABLES[name]
+    plain = render(make_app(False), factory, path)
+    minified = render(make_app(True), factory, path)
+    assert dom(plain) == dom(minified)
+    assert len(minified) < len(plain)
+
+def test_states_render_differently():
+    # Guards against slot names in test_same_dom paths getting out of date
+    app = make_app(False)
+    path = ("/?paged__cur_page=3&sortable__cur_page=2&sortable__sort=1"
+            "&sortable__descending=1&keyset__after_key=100")
+    for name in ["paged_table", "sortable_paged_table", "keyset_paged_table"]:
+        assert (render(app, TABLES[name])
+                != render(app, TABLES[name], path)), name
+
+def test_minify_template():
+    source = """<ul>
+      <!-- items -->
+      {% for i in items %}
+        <li class="a
+                   b">{{ i }} and
+            more</li>
+      {% endfor %}
+    </ul>"""
+    assert minify_template(source) == (
+        '<ul>{% for i in items %}<li class="a b">{{ i }} and more</li>'
+        '{% endfor %}</ul>'
+    )
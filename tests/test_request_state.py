@@ -0,0 +1,44 @@
+"""Component state must not leak between requests sharing app context."""
+import pytest
+from flask import Flask, render_template_string
+
+from flask_bootstrap_components import FlaskBootstrapComponents
+from flask_bootstrap_components.tables import PagedTable
+from flask_bootstrap_components.datasources import ExactRowCount
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test'
+    FlaskBootstrapComponents(app)
+
+    def view():
+        table = PagedTable(["A"], [[i] for i in range(100)], name="p")
+        return render_template_string("{{table.cur_page}} {{url}}",
+                                      table=table,
+                                      url=table.state.build_url(cur_page=1))
+
+    app.add_url_rule('/a', 'a', view)
+    app.add_url_rule('/b', 'b', view)
+    return app
+
+def test_base_args_per_request(app):
+    client = app.test_client()
+    with app.app_context():
+        client.get('/a?q=1')
+        page = client.get('/b').get_data(as_text=True)
+    assert "q=1" not in page
+
+def test_args_index_per_request(app):
+    client = app.test_client()
+    with app.app_context():
+        client.get('/a?p__cur_page=5&q=1')
+        page = client.get('/b').get_data(as_text=True)
+    assert page == "0 /b?p__cur_page=1"
+
+def test_per_page_clamped(app):
+    with app.test_request_context('/a?p__per_page=0'):
+        table = PagedTable(["A"], [[i] for i in range(100)], name="p",
+                           row_count=ExactRowCount())
+        assert table.per_page == 1
+        assert table.page_count == 100
@@ -0,0 +1,110 @@
+"""URLTemplate must build exactly the URLs url_for() does."""
+from uuid import UUID
+
+import pytest
+from flask import Flask, Blueprint, url_for
+from werkzeug.routing import BuildError
+
+from flask_bootstrap_components.utils import URLTemplate, get_url_template
+
+def view(**kwargs):
+    return ""
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SERVER_NAME"] = "example.com"
+    app.add_url_rule("/string/<name>/x", "string", view)
+    app.add_url_rule("/int/<int:id>", "int", view)
+    app.add_url_rule("/fixed/<int(fixed_digits=4):id>", "fixed", view)
+    app.add_url_rule("/float/<float:value>/", "float", view)
+    app.add_url_rule("/path/<path:p>/end", "path", view)
+    app.add_url_rule("/uuid/<uuid:u>", "uuid", view)
+    app.add_url_rule("/any/<any(red, green):color>", "any", view)
+    app.add_url_rule("/two/<int:a>/<b>", "two", view)
+
+    bp = Blueprint("bp", __name__)
+    bp.add_url_rule("/item/<int:id>", "item", view)
+    bp.add_url_rule("/", "index", view)
+    app.register_blueprint(bp, url_prefix="/bp")
+    return app
+
+CASES = [
+    ("string", "name", {}, ["abc", "a b/c", "ž&?#", "", 12]),
+    ("int", "id", {}, [0, 1, 42, 907162534433]),
+    ("fixed", "id", {}, [1, 42, 12345]),
+    ("float", "value", {}, [0.5, 1.25, 3.0]),
+    ("path", "p", {}, ["a", "a/b/c", "x y/ž"]),
+    ("uuid", "u", {}, [UUID("12345678-1234-5678-1234-567812345678")]),
+    ("two", "a", {"b": "fixed value"}, [1, 2]),
+    ("two", "b", {"a": 7}, ["x", "y/z"]),
+    ("int", "id", {"q": "search term", "page": 2}, [1, 2]),
+    ("int", "id", {"_anchor": "top"}, [1, 2]),
+    ("int", "id", {"_external": True}, [1, 2]),
+    ("int", "id", {"_anchor": "a b", "_external": True, "q": "&"}, [5]),
+]
+
+@pytest.mark.parametrize("endpoint, arg, values, samples", CASES)
+def test_matches_url_for(app, endpoint, arg, values, samples):
+    with app.test_request_context():
+        template = URLTemplate(endpoint, arg, values)
+        assert template.converter is not None
+        for value in samples:
+            assert template(value) == url_for(endpoint, **values,
+                                              **{arg: value})
+
+def test_any(app):
+    # Probes are not among allowed values, so the template falls back to
+    # url_for()
+    with app.test_request_context():
+        template = URLTemplate("any", "color", {})
+        for value in ["red", "green"]:
+            assert template(value) == url_for("any", color=value)
+        with pytest.raises(ValueError):
+            url_for("any", color="blue")
+        with pytest.raises(ValueError):
+            template("blue")
+
+def test_invalid_values_fall_back(app):
+    with app.test_request_context():
+        template = URLTemplate("int", "id", {})
+        assert template.converter is not None
+        assert template("12") == url_for("int", id="12")
+        with pytest.raises(BuildError):
+            template(None)
+
+def test_blueprint_relative(app):
+    with app.test_request_context("/bp/"):
+        template = URLTemplate(".item", "id", {"q": "x"})
+        assert template.converter is not None
+        for value in [1, 2, 300]:
+            assert template(value) == url_for(".item", id=value, q="x")
+            assert template(value) == url_for("bp.item", id=value, q="x")
+
+def test_argument_not_in_rule(app):
+    with app.test_request_context():
+        template = URLTemplate("int", "page", {"id": 1})
+        assert template.converter is None
+        assert template(3) == url_for("int", id=1, page=3)
+
+def test_url_defaults_disable_templating(app):
+    @app.url_defaults
+    def add_language(endpoint, values):
+        values.setdefault("lang", "cs")
+
+    with app.test_request_context():
+        template = URLTemplate("int", "id", {})
+        assert template.converter is None
+        assert template(1) == url_for("int", id=1)
+
+def test_cache_per_request(app):
+    app.config["SERVER_NAME"] = None
+    app.add_url_rule("/item/<int:id>", "item", view)
+    with app.app_context():
+        with app.test_request_context("/bp/", base_url="http://one.test"):
+            get_url_template("int", "id", {"_external": True})(1)
+            assert get_url_template(".item", "id", {})(1) == "/bp/item/1"
+        with app.test_request_context("/", base_url="http://two.test"):
+            template = get_url_template("int", "id", {"_external": True})
+            assert template(1) == "http://two.test/int/1"
+            assert get_url_template(".item", "id", {})(1) == "/item/1"